@@ -0,0 +1,132 @@
+import argparse
+import itertools
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from timetable import DatabaseManager, Scheduler, SolverMonitor  # noqa: E402
+from synthetic import TIERS, populate  # noqa: E402
+
+# Times DB loading, generation (per solver mode), validation and Excel export
+# over the synthetic size tiers and prints one JSON document:
+#   python benchmarks/run_benchmarks.py --tiers small,large --out bench.json
+#   python benchmarks/run_benchmarks.py --compare bench.json
+
+
+def measure(fn, memory):
+    # (result, wall seconds, peak MB or None). Peak memory comes from a second
+    # call under tracemalloc so its overhead never leaks into the timing.
+    start = time.perf_counter()
+    result = fn()
+    wall = time.perf_counter() - start
+    peak = None
+    if memory:
+        tracemalloc.start()
+        fn()
+        peak = tracemalloc.get_traced_memory()[1] / 1e6
+        tracemalloc.stop()
+    return result, wall, peak
+
+
+def bench_tier(name, sizes, modes, seed, time_limit, memory):
+    results = []
+    workdir = tempfile.mkdtemp(prefix=f"ttbench_{name}_")
+    try:
+        loads = itertools.count()
+
+        def load():
+            # Fresh file per call: the memory pass must not hit the first pass's rows
+            db = DatabaseManager(os.path.join(workdir, f"load{next(loads)}.db"))
+            populate(db, seed=seed, **sizes)
+            return db
+
+        db, wall, peak = measure(load, memory)
+        results.append({"tier": name, "phase": "db_load", "mode": None, "wall_s": round(wall, 4),
+                        "peak_mb": peak and round(peak, 2), **sizes})
+
+        scheduler = Scheduler(db, time_budget=time_limit)
+        schedule = None
+        for mode in modes:
+            monitor = SolverMonitor()
+
+            def generate():
+                return scheduler.generate(mode, seed=seed, monitor=monitor, use_cache=False)
+
+            (schedule, _), wall, peak = measure(generate, memory)
+            score = scheduler.last_score
+            total = monitor.snapshot()["total_hours"]
+            placed = total - score.unplaced_hours
+            results.append({
+                "tier": name, "phase": "generate", "mode": mode, "wall_s": round(wall, 4),
+                "peak_mb": peak and round(peak, 2),
+                "placement_rate": round(placed / total, 4) if total else None,
+                "attempts_per_placed_hour": round(monitor.snapshot()["attempts"] / placed, 3) if placed else None,
+                "unplaced_hours": score.unplaced_hours, "gaps": score.gaps, **sizes})
+
+        violations, wall, peak = measure(lambda: list(scheduler.validate(schedule, scheduler.last_problem)), memory)
+        results.append({"tier": name, "phase": "validate", "mode": None, "wall_s": round(wall, 4),
+                        "peak_mb": peak and round(peak, 2), "violations": len(violations), **sizes})
+
+        out = os.path.join(workdir, "export.xlsx")
+        _, wall, peak = measure(lambda: scheduler.export_to_excel(schedule, out), memory)
+        results.append({"tier": name, "phase": "export", "mode": None, "wall_s": round(wall, 4),
+                        "peak_mb": peak and round(peak, 2), **sizes})
+        db.close()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    return results
+
+
+def compare(current, baseline):
+    # Prints wall time ratios (current / baseline) for matching tier/phase/mode rows
+    base = {(r["tier"], r["phase"], r["mode"]): r for r in baseline["results"]}
+    for r in current["results"]:
+        old = base.get((r["tier"], r["phase"], r["mode"]))
+        if old and old["wall_s"]:
+            ratio = r["wall_s"] / old["wall_s"]
+            print(f"{r['tier']:>8} {r['phase']:>9} {r['mode'] or '':>9}  {old['wall_s']:9.4f}s -> "
+                  f"{r['wall_s']:9.4f}s  x{ratio:.2f}", file=sys.stderr)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Scheduler / exporter benchmarks on synthetic campuses")
+    parser.add_argument("--tiers", default="small,medium,large", help=f"comma separated, from {', '.join(TIERS)}")
+    parser.add_argument("--modes", default="fast,backtrack", help="solver modes to time")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--time-limit", type=float, default=10.0, help="solver time budget in seconds")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc peak memory pass")
+    parser.add_argument("--out", help="write the JSON here instead of stdout")
+    parser.add_argument("--compare", help="baseline JSON to compare wall times against")
+    args = parser.parse_args(argv)
+
+    report = {
+        "meta": {"python": platform.python_version(), "platform": platform.platform(),
+                 "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"), "seed": args.seed,
+                 "time_limit": args.time_limit},
+        "results": [],
+    }
+    modes = [m for m in args.modes.split(",") if m]
+    for tier in args.tiers.split(","):
+        report["results"] += bench_tier(tier, TIERS[tier], modes, args.seed, args.time_limit, not args.no_memory)
+
+    text = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    if args.compare:
+        with open(args.compare) as f:
+            compare(report, json.load(f))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
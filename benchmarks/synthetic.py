@@ -0,0 +1,37 @@
+import random
+
+# Deterministic synthetic campuses for benchmarking. The same (sizes, seed)
+# always yields the same rows, so timings are comparable across commits.
+
+TIERS = {
+    "small": dict(teachers=20, subjects=6, rooms=12, sections=8),
+    "medium": dict(teachers=60, subjects=8, rooms=40, sections=40),
+    "large": dict(teachers=120, subjects=8, rooms=80, sections=80),
+    "campus": dict(teachers=300, subjects=10, rooms=150, sections=120),
+}
+
+
+def synthetic_rows(teachers, subjects, rooms, sections, lab_ratio=0.25, lab_room_ratio=0.2, seed=0):
+    # {table: [(line number, row dict)]} in the shape DatabaseManager.import_rows takes.
+    # Theory subjects get 2-4 hours a week, Labs one 2-hour block.
+    rng = random.Random(seed)
+    n_labs = round(subjects * lab_ratio)
+    lab_ids = set(rng.sample(range(subjects), n_labs))
+    n_lab_rooms = max(1, round(rooms * lab_room_ratio))
+
+    rows = {
+        "teachers": [{"name": f"Teacher {i}", "code": f"T{i:04d}"} for i in range(teachers)],
+        "subjects": [{"name": f"Subject {i}", "code": f"S{i:03d}",
+                      "type": "Lab" if i in lab_ids else "Theory",
+                      "hours_per_week": 2 if i in lab_ids else rng.randint(2, 4)} for i in range(subjects)],
+        "rooms": [{"name": f"Room {i}", "capacity": rng.choice([40, 60, 80]),
+                   "type": "Lab" if i < n_lab_rooms else "Lecture Hall"} for i in range(rooms)],
+        "sections": [{"name": f"Section {i}"} for i in range(sections)],
+    }
+    return {table: list(enumerate(table_rows, start=2)) for table, table_rows in rows.items()}
+
+
+def populate(db, teachers, subjects, rooms, sections, seed=0, **options):
+    # Loads a synthetic campus into `db`; returns the ImportReports
+    rows = synthetic_rows(teachers, subjects, rooms, sections, seed=seed, **options)
+    return [db.import_rows(table, table_rows) for table, table_rows in rows.items()]
@@ -0,0 +1,24 @@
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [ROOT, os.path.join(ROOT, "benchmarks")]
+
+from timetable import DatabaseManager, Scheduler  # noqa: E402
+from synthetic import TIERS, populate  # noqa: E402
+
+
+@pytest.fixture
+def db():
+    # The small synthetic campus in a private in-memory database
+    db = DatabaseManager(":memory:")
+    populate(db, **TIERS["small"])
+    yield db
+    db.close()
+
+
+@pytest.fixture
+def scheduler(db):
+    return Scheduler(db, time_budget=5)
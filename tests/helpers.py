@@ -0,0 +1,11 @@
+from timetable import validate_schedule
+from timetable.validate import HARD_KINDS
+
+
+def entries(schedule):
+    return {(day, slot, sec_id): entry for day, periods in enumerate(schedule)
+            for slot, cell in enumerate(periods) for sec_id, entry in cell.items()}
+
+
+def hard_violations(problem, schedule):
+    return [v for v in validate_schedule(problem, schedule) if v.kind in HARD_KINDS]
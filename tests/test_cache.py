@@ -0,0 +1,55 @@
+from timetable import SolverStats
+
+
+def test_same_seed_same_timetable(scheduler):
+    scheduler.optimize_moves = 2000
+    first, _ = scheduler.generate(seed=3, use_cache=False)
+    second, _ = scheduler.generate(seed=3, use_cache=False)
+    assert first == second
+
+
+def test_cache_hit_and_miss_on_data_change(db, scheduler):
+    first, _ = scheduler.generate()
+    assert not scheduler.last_cached
+    second, status = scheduler.generate()
+    assert scheduler.last_cached and status.endswith("(cached)")
+    assert second == first
+
+    db.add_room("Extra Hall", 60, "Lecture Hall")
+    scheduler.generate()
+    assert not scheduler.last_cached
+
+
+def test_incomplete_result_not_reused_without_seed(db, scheduler):
+    # One room for the whole campus: hours are always dropped
+    db.conn.execute("DELETE FROM rooms WHERE id > 1")
+    db.changed("rooms")
+    scheduler.time_budget = 0.5
+    scheduler.generate()
+    assert scheduler.last_score.unplaced_hours
+    scheduler.generate()
+    assert not scheduler.last_cached
+    scheduler.generate(seed=scheduler.last_seed)
+    assert scheduler.last_cached
+
+
+def test_parallel_key_covers_workers_and_time_limit(scheduler):
+    scheduler.generate_parallel(runs=4, workers=2, seed=5)
+    assert not scheduler.last_cached
+    scheduler.generate_parallel(runs=4, workers=2, seed=5)
+    assert scheduler.last_cached
+    scheduler.generate_parallel(runs=4, workers=4, seed=5)
+    assert not scheduler.last_cached
+    scheduler.generate_parallel(runs=4, workers=2, seed=5, time_limit=3)
+    assert not scheduler.last_cached
+
+
+def test_parallel_run_cut_by_the_deadline_not_cached_for_its_seed(db, scheduler):
+    # No run can be complete, so the call only ends early at the deadline,
+    # keeping the best of whichever runs were back by then
+    db.conn.execute("DELETE FROM rooms WHERE id > 1")
+    db.changed("rooms")
+    stats = SolverStats()
+    scheduler.generate_parallel(runs=32, workers=2, time_limit=0.01, seed=5, stats=stats)
+    scheduler.generate_parallel(runs=32, workers=2, time_limit=0.01, seed=5)
+    assert scheduler.last_cached == (stats.counters["runs_finished"] == 32)
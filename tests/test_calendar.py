@@ -0,0 +1,49 @@
+from timetable import Scheduler
+
+from helpers import entries
+
+
+def two_shifts(db):
+    # Morning with a break before its last two slots, evening sharing the
+    # morning's last slot; even sections go to the evening
+    morning, evening = db.add_shift("Morning"), db.add_shift("Evening")
+    for start, end in (("08:00", "09:00"), ("09:00", "10:00"), ("10:20", "11:20"), ("11:20", "12:20")):
+        db.add_calendar_slot(morning, start, end)
+    db.add_calendar_slot(morning, "10:00", "10:20", is_break=True)
+    for start, end in (("11:20", "12:20"), ("12:20", "13:20"), ("13:20", "14:20"), ("14:40", "15:40")):
+        db.add_calendar_slot(evening, start, end)
+    db.add_calendar_slot(evening, "14:20", "14:40", is_break=True)
+    db.set_calendar_days(["Mon", "Tue", "Wed", "Thu", "Fri", "Sat"])
+    db.conn.execute("UPDATE sections SET shift_id = ? WHERE id % 2 = 0", (evening,))
+    db.conn.execute("UPDATE sections SET shift_id = ? WHERE id % 2 = 1", (morning,))
+    db.changed("sections")
+
+
+def test_default_week_keeps_its_headers(scheduler):
+    assert scheduler.slots == ["1 (1.10-2.00)", "2 (2.00-2.50)", "3 (2.50-3.40)", "4 (3.40-4.30)",
+                               "5 (4.30-5.15)", "6 (5.15-6.00)"]
+
+
+def test_shifts_and_breaks(db):
+    two_shifts(db)
+    scheduler = Scheduler(db, time_budget=2)
+    assert scheduler.slots[:2] == ["1 (08:00-09:00)", "2 (09:00-10:00)"]
+    schedule, _ = scheduler.generate(seed=1, use_cache=False)
+    problem, calendar = scheduler.last_problem, scheduler.calendar
+    placed = entries(schedule)
+    assert placed
+
+    labs = {}
+    for (day, slot, sec_id), entry in placed.items():
+        shift = problem.section_shift[sec_id]
+        assert calendar.shift_slots[shift] >> slot & 1, "placed outside the section's shift"
+        if problem.subjects[entry["subject_id"]][3] == "Lab":
+            labs.setdefault((day, sec_id, entry["subject_id"]), []).append(slot)
+    assert labs
+    for (day, sec_id, _), slots in labs.items():
+        # Back-to-back Lab blocks of one subject pair up from the first slot
+        split = calendar.split_after.get(problem.section_shift[sec_id], 0)
+        slots.sort()
+        assert len(slots) % 2 == 0
+        for start in slots[::2]:
+            assert not split >> start & 1, "Lab runs across a break"
@@ -0,0 +1,18 @@
+import pytest
+
+from timetable import cli
+
+
+def test_views_are_checked_before_generating(tmp_path, capsys):
+    path = tmp_path / "tt.db"
+    with pytest.raises(SystemExit) as exit_info:
+        cli.main(["generate", "--db", str(path), "--views", "section,bogus", "--out", str(tmp_path / "tt.xlsx")])
+    assert exit_info.value.code == 2
+    assert "unknown view 'bogus'" in capsys.readouterr().err
+    assert not path.exists()
+
+
+def test_views_default_and_list():
+    parser = cli.build_parser()
+    assert parser.parse_args(["generate"]).views == ["section"]
+    assert parser.parse_args(["generate", "--views", "teacher, room"]).views == ["teacher", "room"]
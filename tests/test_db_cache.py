@@ -0,0 +1,32 @@
+import threading
+
+from timetable import DatabaseManager
+
+
+def test_write_from_another_connection_invalidates_the_cache(tmp_path):
+    path = str(tmp_path / "tt.db")
+    first, second = DatabaseManager(path), DatabaseManager(path)
+    first.add_teacher("Asha", "T1")
+    assert first.fetch_all("teachers") == [(1, "Asha", "T1")]
+
+    second.add_teacher("Ben", "T2")
+    assert first.fetch_all("teachers") == [(1, "Asha", "T1"), (2, "Ben", "T2")]
+    assert first.count("teachers") == 2
+    first.close()
+    second.close()
+
+
+def test_write_from_another_thread_is_seen(tmp_path):
+    db = DatabaseManager(str(tmp_path / "tt.db"))
+    db.add_room("Hall A", 60, "Lecture Hall")
+    assert len(db.fetch_all("rooms")) == 1
+
+    def write():
+        db.add_room("Hall B", 60, "Lecture Hall")
+        db.close()
+
+    worker = threading.Thread(target=write)
+    worker.start()
+    worker.join()
+    assert [r[1] for r in db.fetch_all("rooms")] == ["Hall A", "Hall B"]
+    db.close()
@@ -0,0 +1,34 @@
+from helpers import entries, hard_violations
+
+
+def test_pools_follow_eligibility_and_capacity(db, scheduler):
+    db.import_rows("teacher_subjects", [(2, {"teacher": "T0000", "subject": "S000"}),
+                                        (3, {"teacher": "T0001", "subject": "S000"})])
+    db.import_rows("section_subjects", [(2, {"section": "Section 0", "subject": "S000"}),
+                                        (3, {"section": "Section 0", "subject": "S001"})])
+    db.conn.execute("UPDATE sections SET strength = 70 WHERE name = 'Section 0'")
+    db.changed("sections")
+    problem = scheduler.build_problem()
+    teachers = {t[2]: t[0] for t in db.fetch_all("teachers")}
+    sec_id = next(s[0] for s in db.fetch_all("sections") if s[1] == "Section 0")
+    subjects = {s[2]: s[0] for s in db.fetch_all("subjects")}
+    s000 = subjects["S000"]
+
+    own = [lesson for lesson in problem.lessons if lesson.section_id == sec_id]
+    assert {lesson.subject_id for lesson in own} == {s000, subjects["S001"]}
+    for lesson in problem.lessons:
+        if lesson.subject_id == s000:
+            assert lesson.teacher_pool == problem.teacher_bit[teachers["T0000"]] | problem.teacher_bit[teachers["T0001"]]
+        else:
+            assert lesson.teacher_pool == problem.all_teachers
+    for lesson in own:
+        rooms = [r for r in problem.rooms.values() if lesson.room_pool & problem.room_bit[r[0]]]
+        assert rooms and all(r[2] >= 70 for r in rooms)
+
+    schedule, _ = scheduler.generate(problem=problem, seed=1, use_cache=False)
+    for (_, _, placed_sec), entry in entries(schedule).items():
+        if entry["subject_id"] == s000:
+            assert entry["teacher_id"] in (teachers["T0000"], teachers["T0001"])
+        if placed_sec == sec_id:
+            assert problem.rooms[entry["room_id"]][2] >= 70
+    assert hard_violations(problem, schedule) == []
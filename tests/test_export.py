@@ -0,0 +1,50 @@
+import openpyxl
+
+
+def test_section_sheet_layout(db, scheduler, tmp_path):
+    schedule, _ = scheduler.generate(seed=1, use_cache=False)
+    path = tmp_path / "tt.xlsx"
+    scheduler.export_to_excel(schedule, str(path))
+
+    sections = db.fetch_all("sections")
+    wb = openpyxl.load_workbook(path)
+    assert wb.sheetnames == [s[1] for s in sections]
+    ws = wb[sections[0][1]]
+    assert ws["B4"].value == f"Section: {sections[0][1]}"
+    assert [c.value for c in ws[6]] == ["Day / Time"] + scheduler.slots
+    assert [ws.cell(row=7 + day, column=1).value for day in range(len(scheduler.days))] == scheduler.days
+    assert ws["B6"].style == "tt_header" and ws["B7"].style == "tt_cell"
+
+    sec_id = sections[0][0]
+    for day, periods in enumerate(schedule):
+        for slot, cell in enumerate(periods):
+            entry = cell.get(sec_id)
+            text = f"{entry['subject']}\n{entry['teacher']}\n{entry['room']}" if entry else "---"
+            assert ws.cell(row=7 + day, column=2 + slot).value == text
+
+
+def test_view_groups_in_one_workbook(scheduler, tmp_path):
+    schedule, _ = scheduler.generate(seed=1, use_cache=False)
+    path = tmp_path / "tt.xlsx"
+    scheduler.export_to_excel(schedule, str(path), views=("teacher", "room"))
+
+    views = scheduler.build_views(schedule)
+    names = openpyxl.load_workbook(path, read_only=True).sheetnames
+    assert names == [f"T - {name}" for name, _ in views["teacher"].values()] + \
+                    [f"R - {name}" for name, _ in views["room"].values()]
+
+    # Every placed hour shows up in its teacher's and its room's timetable
+    for day, periods in enumerate(schedule):
+        for slot, cell in enumerate(periods):
+            for entry in cell.values():
+                assert (day, slot) in views["teacher"][entry["teacher_id"]][1]
+                assert (day, slot) in views["room"][entry["room_id"]][1]
+
+
+def test_export_split_writes_one_workbook_per_view(scheduler, tmp_path):
+    schedule, _ = scheduler.generate(seed=1, use_cache=False)
+    files = scheduler.export_split(schedule, str(tmp_path / "tt.xlsx"), views=("section", "room"),
+                                   workers=2)
+    assert files == [str(tmp_path / "tt_sections.xlsx"), str(tmp_path / "tt_rooms.xlsx")]
+    rooms = openpyxl.load_workbook(files[1], read_only=True)
+    assert rooms.sheetnames == [name for name, _ in scheduler.build_views(schedule)["room"].values()]
@@ -0,0 +1,53 @@
+import openpyxl
+
+from timetable import DatabaseManager, import_file
+
+
+def test_import_skips_duplicates_and_reports_errors():
+    db = DatabaseManager(":memory:")
+    report = db.import_rows("teachers", [(2, {"name": "Asha", "code": "T1"}), (3, {"name": "Ben", "code": "t1"}),
+                                         (4, {"name": "", "code": "T2"})])
+    assert (report.inserted, report.duplicates, report.errors) == (1, [3], [(4, "missing name")])
+    assert db.fetch_all("teachers") == [(1, "Asha", "T1")]
+
+    report = db.import_rows("subjects", [(2, {"name": "Maths", "code": "S1", "type": "Theory", "hours_per_week": "x"}),
+                                         (3, {"name": "Maths", "code": "S1", "type": "Theory", "hours_per_week": 3})])
+    assert report.inserted == 1
+    assert report.errors == [(2, "hours_per_week must be a whole number, got 'x'")]
+
+
+def test_import_resolves_references(db):
+    report = db.import_rows("teacher_subjects", [(2, {"teacher": "T0000", "subject": "S000"}),
+                                                 (3, {"teacher": "T0000", "subject": "S000"}),
+                                                 (4, {"teacher": "NOPE", "subject": "S000"})])
+    assert (report.inserted, report.duplicates, report.errors) == (1, [3], [(4, "unknown teacher 'NOPE'")])
+    assert db.fetch_teacher_subjects() == [(1, 1)]
+
+
+def test_import_csv_file(tmp_path):
+    path = tmp_path / "rooms.csv"
+    path.write_text("name,capacity,type\nHall A,60,Lecture Hall\nLab 1,30,Lab\nHall A,60,Lecture Hall\n")
+    db = DatabaseManager(":memory:")
+    [report] = import_file(db, str(path))
+    assert (report.table, report.inserted, report.duplicates) == ("rooms", 2, [4])
+
+
+def test_import_workbook_loads_sheets_in_dependency_order(tmp_path):
+    wb = openpyxl.Workbook()
+    wb.active.title = "Teacher Subjects"
+    wb.active.append(["Teacher Code", "Subject Code"])
+    wb.active.append(["T1", "S1"])
+    subjects = wb.create_sheet("Subjects")
+    subjects.append(["Name", "Code", "Type", "Hours"])
+    subjects.append(["Maths", "S1", "Theory", 3])
+    teachers = wb.create_sheet("Faculty")
+    teachers.append(["Name", "Code"])
+    teachers.append(["Asha", "T1"])
+    path = str(tmp_path / "master.xlsx")
+    wb.save(path)
+
+    db = DatabaseManager(":memory:")
+    reports = import_file(db, path)
+    assert [(r.table, r.inserted, r.errors) for r in reports] == [
+        ("teachers", 1, []), ("subjects", 1, []), ("teacher_subjects", 1, [])]
+    assert db.fetch_teacher_subjects() == [(1, 1)]
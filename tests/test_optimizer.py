@@ -0,0 +1,18 @@
+from helpers import entries, hard_violations
+
+
+def hours(schedule):
+    return sorted((sec_id, e["subject_id"]) for (_, _, sec_id), e in entries(schedule).items())
+
+
+def test_optimizer_keeps_the_timetable_valid(scheduler):
+    plain, _ = scheduler.generate(seed=4, use_cache=False)
+    before = scheduler.last_score
+
+    scheduler.optimize_moves = 5000
+    optimized, status = scheduler.generate(seed=4, use_cache=False)
+    assert status == "Success"
+    assert scheduler.last_score.gaps < before.gaps
+    assert hard_violations(scheduler.last_problem, optimized) == []
+    # Same blocks, only moved: each section keeps its hours per subject
+    assert hours(optimized) == hours(plain)
@@ -0,0 +1,32 @@
+import threading
+
+from timetable import engine
+
+from helpers import hard_violations
+
+
+def test_parallel_places_everything(scheduler):
+    schedule, status = scheduler.generate_parallel(workers=2, seed=1, use_cache=False)
+    assert status == "Success"
+    assert hard_violations(scheduler.last_problem, schedule) == []
+
+
+def test_seeded_parallel_keeps_the_same_run(scheduler):
+    picks = set()
+    for _ in range(3):
+        schedule, _ = scheduler.generate_parallel(runs=8, workers=4, seed=7, use_cache=False)
+        picks.add((scheduler.last_seed, scheduler.last_score, repr(schedule)))
+    assert len(picks) == 1
+
+
+def test_stopped_run_is_flagged(scheduler):
+    problem = scheduler.build_problem()
+    stop = threading.Event()
+    try:
+        engine._init_worker(problem, stop)
+        assert engine._solve_seeded("backtrack", 5, 1)[4] is False
+        stop.set()
+        assert engine._solve_seeded("backtrack", 5, 1)[4] is True
+    finally:
+        engine._init_worker(None)
+
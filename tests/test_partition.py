@@ -0,0 +1,43 @@
+from helpers import entries, hard_violations
+
+
+def two_departments(db):
+    # Sections 0-3 take S000-S002 from T0000-T0009, sections 4-7 take
+    # S003-S005 from T0010-T0019
+    teacher_rows, section_rows = [], []
+    for sub in range(6):
+        dept = sub // 3
+        teacher_rows += [(0, {"teacher": f"T{t:04d}", "subject": f"S{sub:03d}"}) for t in range(dept * 10, dept * 10 + 10)]
+        section_rows += [(0, {"section": f"Section {s}", "subject": f"S{sub:03d}"}) for s in range(dept * 4, dept * 4 + 4)]
+    db.import_rows("teacher_subjects", teacher_rows)
+    db.import_rows("section_subjects", section_rows)
+
+
+def test_departments_solve_as_separate_groups(db, scheduler):
+    two_departments(db)
+    problem = scheduler.build_problem()
+    parts = problem.partitions()
+    assert len(parts) == 2
+    assert [sorted({lesson.section_id for lesson in part}) for part in sorted(parts, key=lambda p: p[0].section_id)] == \
+           [[1, 2, 3, 4], [5, 6, 7, 8]]
+
+    schedule, status = scheduler.generate_partitioned(workers=2, seed=1, use_cache=False)
+    assert status == "Success"
+    assert hard_violations(scheduler.last_problem, schedule) == []
+    for (_, _, sec_id), entry in entries(schedule).items():
+        assert (sec_id <= 4) == (entry["teacher_id"] <= 10)
+
+
+def test_open_subjects_keep_one_group(scheduler):
+    assert len(scheduler.build_problem().partitions()) == 1
+    schedule, status = scheduler.generate_partitioned(workers=2, seed=1, use_cache=False)
+    assert status == "Success"
+    assert hard_violations(scheduler.last_problem, schedule) == []
+
+
+def test_partitioned_without_hours(db, scheduler):
+    db.conn.execute("UPDATE subjects SET hours_per_week = 0")
+    db.changed("subjects")
+    schedule, status = scheduler.generate_partitioned(use_cache=False)
+    assert status == "Success"
+    assert entries(schedule) == {}
@@ -0,0 +1,16 @@
+from helpers import entries, hard_violations
+
+
+def test_reschedule_keeps_untouched_blocks(scheduler):
+    schedule, _ = scheduler.generate(seed=1, use_cache=False)
+    before = entries(schedule)
+    teacher_id = next(e["teacher_id"] for (day, _, _), e in before.items() if day == 0)
+
+    repaired, status = scheduler.reschedule(schedule, teacher_unavailable={teacher_id: [0]}, seed=2)
+    after = entries(repaired)
+    assert status.startswith("Success")
+    assert not any(day == 0 and e["teacher_id"] == teacher_id for (day, _, _), e in after.items())
+    for key, entry in before.items():
+        if not (key[0] == 0 and entry["teacher_id"] == teacher_id):
+            assert after.get(key) == entry
+    assert hard_violations(scheduler.last_problem, repaired) == []
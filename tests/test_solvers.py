@@ -0,0 +1,13 @@
+import pytest
+
+from helpers import entries, hard_violations
+
+
+@pytest.mark.parametrize("mode", ["fast", "backtrack"])
+def test_generate_places_everything(scheduler, mode):
+    schedule, status = scheduler.generate(mode, seed=1, use_cache=False)
+    assert status == "Success"
+    assert scheduler.last_score.unplaced_hours == 0
+    assert len(entries(schedule)) == scheduler.last_problem.total_hours()
+    assert hard_violations(scheduler.last_problem, schedule) == []
+
@@ -0,0 +1,19 @@
+import pytest
+
+from timetable import SolverStats
+
+
+def test_stats_report_counters_and_phases(scheduler):
+    stats = SolverStats()
+    scheduler.generate(seed=1, stats=stats, use_cache=False)
+    assert {"fetch", "solve", "build"} <= set(stats.timers)
+    assert stats.counters["placements"] > 0
+    assert "No hours dropped." in stats.summary(scheduler.last_problem)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_profile_report(scheduler, workers):
+    stats = SolverStats(profile=True)
+    scheduler.generate_parallel(runs=2, workers=workers, seed=1, stats=stats, use_cache=False)
+    assert stats.profile_report.startswith(f"Run with seed {scheduler.last_seed}:")
+    assert "solve" in stats.profile_report
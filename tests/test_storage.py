@@ -0,0 +1,33 @@
+from timetable import DatabaseManager, cli
+from synthetic import TIERS, populate
+
+from helpers import entries
+
+
+def test_saved_run_round_trip_and_lookups(db, scheduler):
+    schedule, _ = scheduler.generate(seed=1, use_cache=False)
+    run_id = scheduler.save_schedule(schedule, "backtrack", scheduler.last_seed)
+    assert db.latest_run_id() == run_id
+    assert scheduler.load_schedule(run_id) == schedule
+
+    placed = entries(schedule)
+    (day, slot, sec_id), entry = next(iter(placed.items()))
+    assert db.room_occupant(run_id, entry["room_id"], day, slot) == (sec_id, entry["subject_id"], entry["teacher_id"])
+    week = db.teacher_week(run_id, entry["teacher_id"])
+    assert week == sorted((d, s, sid, e["subject_id"], e["room_id"]) for (d, s, sid), e in placed.items()
+                          if e["teacher_id"] == entry["teacher_id"])
+
+
+def test_query_command(tmp_path, capsys):
+    path = str(tmp_path / "tt.db")
+    db = DatabaseManager(path)
+    populate(db, **TIERS["small"])
+    db.close()
+    assert cli.main(["generate", "--db", path, "--seed", "1", "--time-limit", "5"]) == 0
+    capsys.readouterr()
+
+    assert cli.main(["query", "--db", path, "--teacher", "T0000"]) == 0
+    assert " periods in run 1" in capsys.readouterr().out
+    assert cli.main(["query", "--db", path, "--room", "1", "--day", "Monday", "--slot", "1"]) == 0
+    assert "Monday 1 (1.10-2.00)" in capsys.readouterr().out
+    assert cli.main(["query", "--db", path, "--room", "1"]) == 1
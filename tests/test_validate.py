@@ -0,0 +1,44 @@
+import csv
+import json
+
+from timetable import DatabaseManager, cli, validate_schedule, write_report
+from synthetic import TIERS, populate
+
+
+def test_validate_reports_injected_violations(scheduler):
+    schedule, _ = scheduler.generate(seed=1, use_cache=False)
+    problem = scheduler.last_problem
+    day, slot, cell = next((d, s, c) for d, periods in enumerate(schedule) for s, c in enumerate(periods) if c)
+    sec_id, entry = next(iter(cell.items()))
+    other = next(s for s in problem.sections if s not in cell)
+    cell[other] = dict(entry)  # Same teacher and room, second section
+
+    kinds = {v.kind for v in validate_schedule(problem, schedule)}
+    assert {"teacher_clash", "room_clash"} <= kinds
+
+
+def test_report_files(scheduler, tmp_path):
+    schedule, _ = scheduler.generate(seed=1, use_cache=False)
+    schedule[0][0].clear()
+    violations = list(validate_schedule(scheduler.last_problem, schedule))
+    assert violations and all(v.kind == "shortfall" for v in violations)
+
+    for name in ("report.csv", "report.json"):
+        path = str(tmp_path / name)
+        assert write_report(path, scheduler.last_problem, iter(violations)) == len(violations)
+    with open(tmp_path / "report.csv", newline="") as f:
+        assert len(list(csv.DictReader(f))) == len(violations)
+    rows = json.loads((tmp_path / "report.json").read_text())
+    assert rows[0]["kind"] == "shortfall" and rows[0]["severity"] == "soft"
+
+
+def test_validate_command_exit_codes(tmp_path, capsys):
+    path = str(tmp_path / "tt.db")
+    db = DatabaseManager(path)
+    populate(db, **TIERS["small"])
+    db.close()
+    assert cli.main(["validate", "--db", path]) == 1  # No saved run yet
+    cli.main(["generate", "--db", path, "--seed", "1", "--time-limit", "5"])
+    capsys.readouterr()
+    assert cli.main(["validate", "--db", path, "--out", str(tmp_path / "report.json")]) == 0
+    assert json.loads((tmp_path / "report.json").read_text()) == []
@@ -0,0 +1,6 @@
+# Timetable engine: data access, solvers, validation and Excel export. Importing the
+# package never loads the GUI (see timetable.gui / timetable.cli).
+from .db import DatabaseManager, ImportReport, import_file
+from .engine import (OccupancyGrid, TimetableProblem, Scheduler, SolverMonitor, SolverStats, ScheduleOptimizer,
+                     ScheduleScore, SOLVERS, score_placements)
+from .validate import Violation, validate_schedule, write_report
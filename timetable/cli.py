@@ -0,0 +1,237 @@
+import argparse
+
+from .db import DatabaseManager, IMPORT_SPECS, import_file
+from .engine import Scheduler, SolverStats, SOLVERS
+from .export import VIEW_LABELS
+from .validate import HARD_KINDS, report_rows, summarize, write_report
+
+# Headless entry point. Only the engine modules are imported here; the
+# customtkinter GUI is loaded lazily when no command (or `gui`) is given.
+
+
+def view_list(text):
+    # --views: checked while parsing, before anything is generated
+    views = [v.strip() for v in text.split(",") if v.strip()]
+    unknown = [v for v in views if v not in VIEW_LABELS]
+    if unknown or not views:
+        raise argparse.ArgumentTypeError(
+            f"unknown view {', '.join(map(repr, unknown)) or repr(text)} (choose from {', '.join(VIEW_LABELS)})")
+    return views
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="time-table-generator",
+        description="College timetable generator. Run without a command to open the GUI.")
+    commands = parser.add_subparsers(dest="command")
+
+    gen = commands.add_parser("generate", help="generate a timetable (and export it) without the GUI")
+    gen.add_argument("--db", default="timetable.db", help="SQLite database (default: timetable.db)")
+    gen.add_argument("--out", help="Excel file to write, e.g. tt.xlsx")
+    gen.add_argument("--seed", type=int, help="random seed, for reproducible runs")
+    gen.add_argument("--workers", type=int, default=1, help="worker processes for parallel seeded runs")
+    gen.add_argument("--runs", type=int, help="seeded runs to try (default: one per worker)")
+    gen.add_argument("--partition", action="store_true",
+                     help="solve groups of sections that share no teacher separately, on --workers processes")
+    gen.add_argument("--mode", choices=sorted(SOLVERS), default="backtrack", help="solver engine")
+    gen.add_argument("--time-limit", type=float, default=10.0, help="solver time budget in seconds")
+    gen.add_argument("--optimize", type=float, default=0.0, metavar="SECONDS",
+                     help="then spend this long reducing gaps, daily overload and same-day repeats (default: off)")
+    gen.add_argument("--optimize-moves", type=int, metavar="N",
+                     help="optimize for exactly N moves instead (same seed, same result)")
+    gen.add_argument("--no-cache", action="store_true",
+                     help="always solve, even if a result for the same data and settings is cached")
+    gen.add_argument("--views", type=view_list, default="section",
+                     help="comma separated views to export: section,teacher,room (default: section)")
+    gen.add_argument("--split", action="store_true", help="write one workbook per view instead of one workbook")
+    gen.add_argument("--no-save", action="store_true", help="do not store the run in the database")
+    gen.add_argument("--stats", action="store_true",
+                     help="print solver counters, phase timings and why hours were dropped")
+    gen.add_argument("--profile", action="store_true", help="run the solve under cProfile and print the top functions")
+    gen.add_argument("--report", help="check the result and write the violations to a .csv or .json file")
+
+    val = commands.add_parser("validate", help="check a saved timetable for clashes, shortfalls and misfits")
+    val.add_argument("--db", default="timetable.db", help="SQLite database (default: timetable.db)")
+    val.add_argument("--run", type=int, help="saved run id (default: the latest)")
+    val.add_argument("--out", help="also write the violations to a .csv or .json file")
+    val.add_argument("--max-daily", type=int, default=5, help="teaching hours a day before a teacher is overloaded")
+    val.add_argument("--limit", type=int, default=50, help="violations to print (default: 50, 0 for all)")
+
+    query = commands.add_parser("query", help="look up a saved timetable: a teacher's week or who is in a room")
+    query.add_argument("--db", default="timetable.db", help="SQLite database (default: timetable.db)")
+    query.add_argument("--run", type=int, help="saved run id (default: the latest)")
+    query.add_argument("--teacher", help="teacher code, name or id: print their week")
+    query.add_argument("--room", help="room name or id: print who is in it at --day / --slot")
+    query.add_argument("--day", help="day name or number (1 = first day)")
+    query.add_argument("--slot", type=int, help="period number (1 = first period)")
+
+    imp = commands.add_parser("import", help="bulk import teachers, subjects, rooms, sections or the calendar")
+    imp.add_argument("file", help=".xlsx workbook (one sheet per table) or .csv file")
+    imp.add_argument("--db", default="timetable.db", help="SQLite database (default: timetable.db)")
+    imp.add_argument("--table", choices=sorted(IMPORT_SPECS), help="target table (default: from sheet/file name)")
+
+    commands.add_parser("gui", help="open the desktop application (default)")
+    return parser
+
+
+def run_generate(args):
+    db = DatabaseManager(args.db)
+    scheduler = Scheduler(db, mode=args.mode, time_budget=args.time_limit, optimize_time=args.optimize,
+                          optimize_moves=args.optimize_moves)
+    stats = SolverStats(profile=args.profile) if args.stats or args.profile else None
+    runs = args.runs or args.workers
+    if args.partition:
+        schedule, status = scheduler.generate_partitioned(workers=args.workers, seed=args.seed, stats=stats,
+                                                          use_cache=not args.no_cache)
+    elif runs > 1:
+        schedule, status = scheduler.generate_parallel(runs=runs, workers=args.workers, seed=args.seed, stats=stats,
+                                                       use_cache=not args.no_cache)
+    else:
+        schedule, status = scheduler.generate(seed=args.seed, stats=stats, use_cache=not args.no_cache)
+    if not schedule:
+        print(f"Failed: {status}")
+        return 1
+
+    score = scheduler.last_score
+    print(f"{status}: seed {scheduler.last_seed}, {score.unplaced_hours} unplaced hours, "
+          f"{score.violations} violations, {score.gaps} gaps")
+    if not args.no_save and not scheduler.last_cached:
+        run_id = scheduler.save_schedule(schedule, args.mode, scheduler.last_seed)
+        print(f"Saved as run {run_id} in {args.db}")
+    if args.out:
+        if args.split:
+            for filename in scheduler.export_split(schedule, args.out, workers=args.workers, views=args.views):
+                print(f"Wrote {filename}")
+        else:
+            scheduler.export_to_excel(schedule, args.out, views=args.views, stats=stats)
+            print(f"Wrote {args.out}")
+    if stats is not None:
+        print(stats.summary(scheduler.build_problem()))
+        if stats.profile_report:
+            print(stats.profile_report)
+    if args.report:
+        count = write_report(args.report, scheduler.last_problem, scheduler.validate(schedule, scheduler.last_problem))
+        print(f"Wrote {count} violations to {args.report}")
+    return 0
+
+
+def run_validate(args):
+    # Prints violations as the validator finds them (clashes and misfits first,
+    # totals like shortfalls after); exits 1 if any hard rule is broken
+    db = DatabaseManager(args.db)
+    scheduler = Scheduler(db)
+    if args.run is not None and not db.fetch_schedule(args.run):
+        print(f"Failed: no saved run {args.run}")
+        return 1
+    schedule = scheduler.load_schedule(args.run)
+    problem = scheduler.build_problem()
+    if not schedule or problem is None:
+        print("Failed: no saved timetable" if not schedule else "Failed: missing data")
+        return 1
+
+    found = []
+
+    def shown(violations):
+        for v in violations:
+            found.append(v)
+            if not args.limit or len(found) <= args.limit:
+                print(f"{v.kind}: {describe(problem, v)}")
+            yield v
+
+    violations = shown(scheduler.validate(schedule, problem, args.max_daily))
+    if args.out:
+        write_report(args.out, problem, violations)
+    else:
+        for _ in violations:
+            pass
+    if args.limit and len(found) > args.limit:
+        print(f"... {len(found) - args.limit} more")
+    print(f"Checked: {summarize(found)}")
+    if args.out:
+        print(f"Wrote {len(found)} violations to {args.out}")
+    return 1 if any(v.kind in HARD_KINDS for v in found) else 0
+
+
+def describe(problem, v):
+    row = next(report_rows(problem, [v]))
+    where = " ".join(filter(None, (row["day"], row["slot"])))
+    return ", ".join(filter(None, (where, row["section"], row["subject"], row["teacher"], row["room"]))) \
+        + f" - {v.detail}"
+
+
+def run_query(args):
+    db = DatabaseManager(args.db)
+    scheduler = Scheduler(db)
+    run_id = args.run or db.latest_run_id()
+    if run_id is None or not (args.teacher or args.room):
+        print("Failed: no saved timetable" if run_id is None else "Failed: give --teacher or --room")
+        return 1
+    days, slots = scheduler.days, scheduler.slots
+    sections = {s[0]: s[1] for s in db.fetch_all("sections")}
+    subjects = {s[0]: s[1] for s in db.fetch_all("subjects")}
+    if args.teacher:
+        teacher = find_record(db.fetch_all("teachers"), args.teacher, 2)
+        if teacher is None:
+            print(f"Failed: unknown teacher {args.teacher!r}")
+            return 1
+        rooms = {r[0]: r[1] for r in db.fetch_all("rooms")}
+        week = db.teacher_week(run_id, teacher[0])
+        print(f"{teacher[1]}: {len(week)} periods in run {run_id}")
+        for day, slot, sec_id, sub_id, room_id in week:
+            if day < len(days) and slot < len(slots):
+                print(f"  {days[day]} {slots[slot]}: {subjects.get(sub_id, sub_id)}, "
+                      f"{sections.get(sec_id, sec_id)}, {rooms.get(room_id, room_id)}")
+        return 0
+
+    room = find_record(db.fetch_all("rooms"), args.room)
+    day = next((i for i, name in enumerate(days) if args.day and name.lower() == args.day.lower()), None)
+    if day is None and args.day and args.day.isdigit():
+        day = int(args.day) - 1
+    if room is None or day is None or not 0 <= day < len(days) or not args.slot or not 0 < args.slot <= len(slots):
+        print("Failed: give a known --room, a --day and a --slot")
+        return 1
+    occupant = db.room_occupant(run_id, room[0], day, args.slot - 1)
+    if occupant is None:
+        print(f"{room[1]} is free on {days[day]} {slots[args.slot - 1]}")
+    else:
+        teachers = {t[0]: t[1] for t in db.fetch_all("teachers")}
+        sec_id, sub_id, teacher_id = occupant
+        print(f"{room[1]} on {days[day]} {slots[args.slot - 1]}: {subjects.get(sub_id, sub_id)}, "
+              f"{sections.get(sec_id, sec_id)}, {teachers.get(teacher_id, teacher_id)}")
+    return 0
+
+
+def find_record(rows, key, code_column=None):
+    # Row whose id, name or code (case-insensitive) is `key`, or None
+    key = key.strip().lower()
+    for row in rows:
+        if key in (str(row[0]), str(row[1]).lower()) or (code_column and str(row[code_column]).lower() == key):
+            return row
+    return None
+
+
+def run_import(args):
+    db = DatabaseManager(args.db)
+    try:
+        reports = import_file(db, args.file, args.table)
+    except ValueError as e:
+        print(f"Failed: {e}")
+        return 1
+    for report in reports:
+        print(f"{report.table}: {report.inserted} imported, {len(report.duplicates)} duplicates skipped, "
+              f"{len(report.errors)} rejected")
+        for line_no, message in report.errors:
+            print(f"  row {line_no}: {message}")
+    return 0
+
+
+COMMANDS = {"generate": run_generate, "import": run_import, "validate": run_validate, "query": run_query}
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.command in (None, "gui"):
+        from .gui import TimeTableApp  # Deferred: Tk/CTk are only loaded for the GUI
+        TimeTableApp().mainloop()
+        return 0
+    return COMMANDS[args.command](args)
@@ -0,0 +1,747 @@
+import csv
+import os
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+
+import openpyxl
+
+# --- DATABASE MANAGER ---
+class DatabaseManager:
+    # Every thread gets its own connection (WAL mode, so the solver thread and
+    # the UI read concurrently). Whole-table reads are cached in memory per
+    # table and dropped when a write bumps that table's version; writes made
+    # through another connection or process are noticed via PRAGMA data_version.
+    CACHED_TABLES = ("teachers", "subjects", "rooms", "sections", "teacher_subjects", "section_subjects",
+                     "shifts", "calendar_days", "calendar_slots")
+
+    def __init__(self, db_name="timetable.db"):
+        self.db_name = db_name
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._shared = None
+        if db_name == ":memory:":
+            # A private in-memory database only exists on one connection
+            self._shared = sqlite3.connect(db_name, check_same_thread=False)
+        self.versions = dict.fromkeys(self.CACHED_TABLES, 0)
+        self._cache = {}  # (table, query) -> (version, rows)
+        self.create_tables()
+
+    @property
+    def conn(self):
+        if self._shared is not None:
+            return self._shared
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = sqlite3.connect(self.db_name, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.data_version = None
+        return conn
+
+    @property
+    def cursor(self):
+        cursor = getattr(self._local, "cursor", None)
+        if cursor is None or cursor.connection is not self.conn:
+            cursor = self._local.cursor = self.conn.cursor()
+        return cursor
+
+    def close(self):
+        # Closes the calling thread's connection (the next call opens a new one)
+        conn = getattr(self._local, "conn", None) or self._shared
+        if conn is not None:
+            conn.close()
+        self._local.conn = self._local.cursor = self._shared = None
+
+    def changed(self, *tables):
+        with self._lock:
+            for table in tables:
+                self.versions[table] = self.versions.get(table, 0) + 1
+
+    def appended(self, table, row):
+        # A single-row insert: the cached copy of the table (if current) gets
+        # the row instead of being thrown away. Another thread may have read
+        # the table between the commit and this call, in which case the copy
+        # already ends with the row (it has the highest id).
+        key = (table, f"SELECT * FROM {table}")
+        with self._lock:
+            hit = self._cache.get(key)
+            self.versions[table] += 1
+            if hit is not None and hit[0] == self.versions[table] - 1:
+                if not hit[1] or hit[1][-1][0] < row[0]:
+                    hit[1].append(row)
+                self._cache[key] = (self.versions[table], hit[1])
+
+    def check_external_writes(self):
+        # data_version moves when another connection commits; the cache cannot
+        # tell which tables, so it is dropped as a whole
+        if self._shared is not None:
+            return
+        version = self.conn.execute("PRAGMA data_version").fetchone()[0]
+        if self._local.data_version is not None and version != self._local.data_version:
+            self.changed(*self.CACHED_TABLES)
+        self._local.data_version = version
+
+    def cached(self, table, sql):
+        # Rows of `sql` (a read of `table` only), from the cache while the
+        # table has not been written since
+        self.check_external_writes()
+        key = (table, sql)
+        with self._lock:
+            version = self.versions.get(table, 0)
+            hit = self._cache.get(key)
+        if hit is not None and hit[0] == version:
+            return hit[1]
+        rows = self.conn.execute(sql).fetchall()
+        with self._lock:
+            self._cache[key] = (version, rows)
+        return rows
+
+    def create_tables(self):
+        # Teachers Table
+        self.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS teachers (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT NOT NULL,
+                code TEXT UNIQUE
+            )
+        """)
+        # Subjects Table
+        self.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS subjects (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT NOT NULL,
+                code TEXT,
+                type TEXT, -- 'Theory' or 'Lab'
+                hours_per_week INTEGER
+            )
+        """)
+        # Rooms Table
+        self.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS rooms (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT UNIQUE,
+                capacity INTEGER,
+                type TEXT -- 'Lecture Hall' or 'Lab'
+            )
+        """)
+        # Calendar: the teaching days, and per shift its slots and breaks. Empty
+        # tables mean the default week (Scheduler.calendar / engine.Calendar).
+        self.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS shifts (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT UNIQUE NOT NULL
+            )
+        """)
+        self.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS calendar_days (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT UNIQUE NOT NULL,
+                position INTEGER -- display order; NULL sorts after, in insert order
+            )
+        """)
+        self.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS calendar_slots (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                shift_id INTEGER NOT NULL REFERENCES shifts(id),
+                start_time TEXT NOT NULL, -- 'HH:MM', 24-hour
+                end_time TEXT NOT NULL,
+                is_break INTEGER NOT NULL DEFAULT 0,
+                UNIQUE (shift_id, start_time)
+            )
+        """)
+        # Sections Table
+        self.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS sections (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT UNIQUE,
+                strength INTEGER, -- number of students, NULL if unknown
+                shift_id INTEGER REFERENCES shifts(id) -- NULL: the first shift
+            )
+        """)
+        self.add_missing_column("sections", "strength", "INTEGER")
+        self.add_missing_column("sections", "shift_id", "INTEGER REFERENCES shifts(id)")
+        # Eligibility: which teachers can take a subject and which subjects a
+        # section takes. A subject (section) with no rows is open to every
+        # teacher (takes every subject), as before these tables existed.
+        self.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS teacher_subjects (
+                teacher_id INTEGER NOT NULL REFERENCES teachers(id),
+                subject_id INTEGER NOT NULL REFERENCES subjects(id),
+                PRIMARY KEY (teacher_id, subject_id)
+            ) WITHOUT ROWID
+        """)
+        self.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS section_subjects (
+                section_id INTEGER NOT NULL REFERENCES sections(id),
+                subject_id INTEGER NOT NULL REFERENCES subjects(id),
+                PRIMARY KEY (section_id, subject_id)
+            ) WITHOUT ROWID
+        """)
+        # Generated Schedules: one row per generation run ...
+        self.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS schedule_runs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+                mode TEXT,
+                seed INTEGER
+            )
+        """)
+        # ... and one row per occupied (day, slot) of a section, integer keys only
+        self.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS schedule_entries (
+                run_id INTEGER NOT NULL REFERENCES schedule_runs(id),
+                day INTEGER NOT NULL, -- index into Scheduler.days
+                slot INTEGER NOT NULL, -- index into Scheduler.slots
+                section_id INTEGER NOT NULL REFERENCES sections(id),
+                subject_id INTEGER NOT NULL REFERENCES subjects(id),
+                teacher_id INTEGER NOT NULL REFERENCES teachers(id),
+                room_id INTEGER NOT NULL REFERENCES rooms(id),
+                PRIMARY KEY (run_id, section_id, day, slot)
+            ) WITHOUT ROWID
+        """)
+        # Finished results keyed by a hash of the input data and solver settings
+        # (Scheduler.cache_key); least recently used entries are evicted
+        self.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS result_cache (
+                key TEXT PRIMARY KEY,
+                last_used REAL NOT NULL,
+                seed INTEGER,
+                payload BLOB NOT NULL
+            )
+        """)
+        # Case-insensitive indexes behind the list views' "starts with" search
+        for table, columns in SEARCH_COLUMNS.items():
+            for column in columns:
+                self.cursor.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_{column} ON {table} ({column} COLLATE NOCASE)")
+        # Covering indexes: "who is in room X at slot Y" and "teacher Z's week"
+        self.cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_entries_room
+            ON schedule_entries (run_id, room_id, day, slot, section_id, subject_id, teacher_id)
+        """)
+        self.cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_entries_teacher
+            ON schedule_entries (run_id, teacher_id, day, slot, section_id, subject_id, room_id)
+        """)
+        self.conn.commit()
+
+    def add_missing_column(self, table, column, decl):
+        # Upgrades databases created before `column` was added to `table`
+        self.cursor.execute(f"PRAGMA table_info({table})")
+        if column not in {row[1] for row in self.cursor.fetchall()}:
+            self.cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {decl}")
+
+    def add_teacher(self, name, code):
+        # Returns the new teacher's id, or False if the code is taken
+        try:
+            self.cursor.execute("INSERT INTO teachers (name, code) VALUES (?, ?)", (name, code))
+            self.conn.commit()
+            self.appended("teachers", (self.cursor.lastrowid, name, code))
+            return self.cursor.lastrowid
+        except sqlite3.IntegrityError:
+            return False
+
+    def add_subject(self, name, code, sub_type, hours):
+        self.cursor.execute("INSERT INTO subjects (name, code, type, hours_per_week) VALUES (?, ?, ?, ?)", 
+                            (name, code, sub_type, hours))
+        self.conn.commit()
+        self.appended("subjects", (self.cursor.lastrowid, name, code, sub_type, hours))
+
+    def add_room(self, name, capacity, room_type):
+        try:
+            self.cursor.execute("INSERT INTO rooms (name, capacity, type) VALUES (?, ?, ?)", (name, capacity, room_type))
+            self.conn.commit()
+            self.appended("rooms", (self.cursor.lastrowid, name, capacity, room_type))
+            return True
+        except sqlite3.IntegrityError:
+            return False
+            
+    def add_section(self, name, strength=None, shift_id=None):
+        # Returns the new section's id, or False if the name is taken
+        try:
+            self.cursor.execute("INSERT INTO sections (name, strength, shift_id) VALUES (?, ?, ?)",
+                                (name, strength, shift_id))
+            self.conn.commit()
+            self.appended("sections", (self.cursor.lastrowid, name, strength, shift_id))
+            return self.cursor.lastrowid
+        except sqlite3.IntegrityError:
+            return False
+
+    def add_shift(self, name):
+        # Returns the new shift's id, or False if the name is taken
+        try:
+            self.cursor.execute("INSERT INTO shifts (name) VALUES (?)", (name,))
+            self.conn.commit()
+            self.appended("shifts", (self.cursor.lastrowid, name))
+            return self.cursor.lastrowid
+        except sqlite3.IntegrityError:
+            return False
+
+    def add_calendar_slot(self, shift_id, start, end, is_break=False):
+        # One teaching slot (or break) of a shift; times are "HH:MM". Raises
+        # ValueError like an imported row would.
+        values = (shift_id,) + _slot_times({"start": start, "end": end}) + (int(bool(is_break)),)
+        self.slot_checker()(values)
+        try:
+            with self.conn:
+                self.cursor.execute("INSERT INTO calendar_slots (shift_id, start_time, end_time, is_break) "
+                                    "VALUES (?, ?, ?, ?)", values)
+        except sqlite3.IntegrityError:
+            raise ValueError(f"the shift already has a slot starting at {values[1]}")
+        self.changed("calendar_slots")
+        return self.cursor.lastrowid
+
+    def set_calendar_days(self, names):
+        # Replaces the teaching days, in the given order
+        with self.conn:
+            self.cursor.execute("DELETE FROM calendar_days")
+            self.cursor.executemany("INSERT INTO calendar_days (name, position) VALUES (?, ?)",
+                                    ((name, position) for position, name in enumerate(names)))
+        self.changed("calendar_days")
+
+    def clear_calendar(self):
+        # Back to the default week: no days, shifts or slots; sections lose their shift
+        with self.conn:
+            self.cursor.execute("UPDATE sections SET shift_id=NULL WHERE shift_id IS NOT NULL")
+            for table in ("calendar_slots", "calendar_days", "shifts"):
+                self.cursor.execute(f"DELETE FROM {table}")
+        self.changed("sections", "calendar_slots", "calendar_days", "shifts")
+
+    def fetch_calendar(self):
+        # (day names in order, (shift id, name) rows, (shift id, start, end,
+        # is_break) slot rows in time order), as engine.Calendar takes them
+        days = self.cached("calendar_days", "SELECT name FROM calendar_days ORDER BY position IS NULL, position, id")
+        shifts = self.cached("shifts", "SELECT id, name FROM shifts ORDER BY id")
+        slots = self.cached("calendar_slots", "SELECT shift_id, start_time, end_time, is_break FROM calendar_slots "
+                                              "ORDER BY shift_id, start_time")
+        return [day for day, in days], list(shifts), list(slots)
+
+    def slot_checker(self, exclude_id=None):
+        # Validator for new calendar_slots values: teaching slots of different
+        # shifts must either match exactly or not overlap (see engine.Calendar)
+        taken = [(start, end) for record_id, start, end in self.conn.execute(
+            "SELECT id, start_time, end_time FROM calendar_slots WHERE is_break=0").fetchall() if record_id != exclude_id]
+
+        def check(values):
+            _, start, end, is_break = values
+            if is_break:
+                return
+            for other_start, other_end in taken:
+                if (start, end) != (other_start, other_end) and start < other_end and other_start < end:
+                    raise ValueError(f"slot {start}-{end} overlaps the slot {other_start}-{other_end}")
+            taken.append((start, end))
+        return check
+
+    def set_teacher_subjects(self, teacher_id, subject_ids):
+        # Replaces the subjects a teacher is qualified for
+        with self.conn:
+            self.cursor.execute("DELETE FROM teacher_subjects WHERE teacher_id=?", (teacher_id,))
+            self.cursor.executemany("INSERT OR IGNORE INTO teacher_subjects (teacher_id, subject_id) VALUES (?, ?)",
+                                    ((teacher_id, sub_id) for sub_id in subject_ids))
+        self.changed("teacher_subjects")
+
+    def set_section_subjects(self, section_id, subject_ids):
+        # Replaces the subjects a section takes
+        with self.conn:
+            self.cursor.execute("DELETE FROM section_subjects WHERE section_id=?", (section_id,))
+            self.cursor.executemany("INSERT OR IGNORE INTO section_subjects (section_id, subject_id) VALUES (?, ?)",
+                                    ((section_id, sub_id) for sub_id in subject_ids))
+        self.changed("section_subjects")
+
+    def fetch_teacher_subjects(self):
+        # (teacher_id, subject_id) rows
+        return list(self.cached("teacher_subjects", "SELECT teacher_id, subject_id FROM teacher_subjects"))
+
+    def fetch_section_subjects(self):
+        # (section_id, subject_id) rows
+        return list(self.cached("section_subjects", "SELECT section_id, subject_id FROM section_subjects"))
+
+    def fetch_all(self, table):
+        if table in self.versions:
+            return list(self.cached(table, f"SELECT * FROM {table}"))
+        self.cursor.execute(f"SELECT * FROM {table}")
+        return self.cursor.fetchall()
+
+    def count(self, table, search=""):
+        # Row count without loading the rows (or from the cached rows if loaded)
+        if search:
+            where, params = search_clause(table, search)
+            return self.conn.execute(f"SELECT COUNT(*) FROM {table}{where}", params).fetchone()[0]
+        if table in self.versions:
+            self.check_external_writes()
+            with self._lock:
+                hit = self._cache.get((table, f"SELECT * FROM {table}"))
+            if hit is not None and hit[0] == self.versions[table]:
+                return len(hit[1])
+            return self.cached(table, f"SELECT COUNT(*) FROM {table}")[0][0]
+        return self.conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+    def fetch_window(self, table, offset, limit, search=""):
+        # `limit` rows from position `offset` in id order, optionally only those
+        # whose name/code starts with `search`; what a list view shows at a time
+        where, params = search_clause(table, search)
+        return self.conn.execute(f"SELECT * FROM {table}{where} ORDER BY id LIMIT ? OFFSET ?",
+                                 params + (limit, offset)).fetchall()
+
+    def update_record(self, table, record_id, row):
+        # Overwrites a record from a {column: text} row, validated like an
+        # imported one; raises ValueError on bad input or a taken code/name
+        spec = IMPORT_SPECS[table]
+        values = self.ref_resolver(table, by_id=True)(spec["parse"](row))
+        if "check" in spec:
+            spec["check"](self, record_id)(values)
+        assignments = ", ".join(f"{column}=?" for column in spec["columns"])
+        try:
+            with self.conn:
+                self.cursor.execute(f"UPDATE {table} SET {assignments} WHERE id=?", values + (record_id,))
+        except sqlite3.IntegrityError:
+            key = " ".join(str(values[spec["columns"].index(k)]) for k in spec["key"].split())
+            raise ValueError(f"{spec['key']} {key!r} is already in use")
+        self.changed(table)
+
+    def delete_record(self, table, record_id):
+        with self.conn:
+            self.cursor.execute(f"DELETE FROM {table} WHERE id=?", (record_id,))
+            for mapping, column in MAPPING_REFS.get(table, ()):
+                self.cursor.execute(f"DELETE FROM {mapping} WHERE {column}=?", (record_id,))
+            for referrer, column in NULLED_REFS.get(table, ()):
+                self.cursor.execute(f"UPDATE {referrer} SET {column}=NULL WHERE {column}=?", (record_id,))
+        self.changed(table, *(other for other, _ in MAPPING_REFS.get(table, []) + NULLED_REFS.get(table, [])))
+
+    def ref_resolver(self, table, by_id=False):
+        # Function turning parsed values of `table` into insert values: columns
+        # listed in the spec's "refs" hold a code/name, looked up to its id (an
+        # id itself is accepted with by_id, as the list views show ids). Blank
+        # optional references stay NULL.
+        spec = IMPORT_SPECS[table]
+        refs = {}  # column index -> {lower-case code/name: id}
+        for column, (ref_table, ref_key) in spec.get("refs", {}).items():
+            self.cursor.execute(f"SELECT {ref_key}, id FROM {ref_table}")
+            ids = {}
+            for key, ref_id in self.cursor.fetchall():
+                if by_id:
+                    ids[str(ref_id)] = ref_id
+                if key is not None:
+                    ids[str(key).strip().lower()] = ref_id
+            refs[spec["columns"].index(column)] = ids
+
+        def resolve(values):
+            values = list(values)
+            for index, ids in refs.items():
+                if values[index] is None:
+                    continue
+                if values[index].lower() not in ids:
+                    raise ValueError(f"unknown {spec['columns'][index][:-3]} {values[index]!r}")
+                values[index] = ids[values[index].lower()]
+            return tuple(values)
+        return resolve
+
+    def import_rows(self, table, rows):
+        # Bulk load of dict rows (lower-case column names) into one of the data
+        # tables: every row is validated, duplicates of the UNIQUE code/name (in
+        # the file or already stored) are skipped, and all good rows go in with
+        # a single executemany in one transaction. Mapping tables name their
+        # teachers/subjects/sections by code or name; those are resolved to ids
+        # (as are a section's shift and a calendar slot's shift, by name).
+        spec = IMPORT_SPECS[table]
+        keys = spec["key"].split()
+        self.cursor.execute(f"SELECT {', '.join(keys)} FROM {table}")
+        seen = {tuple(str(v).strip().lower() for v in row) for row in self.cursor.fetchall() if None not in row}
+        key_indexes = [spec["columns"].index(key) for key in keys]
+        resolve = self.ref_resolver(table)
+        check = spec["check"](self) if "check" in spec else None
+        duplicates, errors = [], []
+
+        def valid_rows():
+            for line_no, row in rows:
+                try:
+                    values = resolve(spec["parse"](row))
+                    key = tuple(str(values[i]).lower() for i in key_indexes)
+                    if key in seen:
+                        duplicates.append(line_no)
+                        continue
+                    if check:
+                        check(values)
+                except ValueError as e:
+                    errors.append((line_no, str(e)))
+                    continue
+                seen.add(key)
+                yield values
+
+        columns = ", ".join(spec["columns"])
+        marks = ", ".join("?" * len(spec["columns"]))
+        with self.conn:
+            self.cursor.executemany(f"INSERT INTO {table} ({columns}) VALUES ({marks})", valid_rows())
+            inserted = self.cursor.rowcount
+        self.changed(table)
+        return ImportReport(table, inserted, duplicates, errors)
+
+    def save_schedule(self, entries, mode=None, seed=None):
+        # entries: iterable of (day, slot, section_id, subject_id, teacher_id, room_id).
+        # Stored as a new run in a single transaction; returns the run id.
+        with self.conn:
+            self.cursor.execute("INSERT INTO schedule_runs (mode, seed) VALUES (?, ?)", (mode, seed))
+            run_id = self.cursor.lastrowid
+            self.cursor.executemany("""
+                INSERT INTO schedule_entries (run_id, day, slot, section_id, subject_id, teacher_id, room_id)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """, ((run_id,) + tuple(entry) for entry in entries))
+        return run_id
+
+    def cache_get(self, key):
+        # (seed, payload) of a cached result, marking it as just used; or None
+        with self.conn:
+            row = self.conn.execute("SELECT seed, payload FROM result_cache WHERE key=?", (key,)).fetchone()
+            if row is not None:
+                self.conn.execute("UPDATE result_cache SET last_used=? WHERE key=?", (time.time(), key))
+        return row
+
+    def cache_put(self, keys, seed, payload, max_entries=32):
+        # Stores one result under every key in `keys`, then keeps only the
+        # `max_entries` most recently used entries
+        now = time.time()
+        with self.conn:
+            self.conn.executemany("INSERT OR REPLACE INTO result_cache (key, last_used, seed, payload) VALUES (?, ?, ?, ?)",
+                                  ((key, now, seed, payload) for key in keys))
+            self.conn.execute("""
+                DELETE FROM result_cache WHERE key NOT IN
+                (SELECT key FROM result_cache ORDER BY last_used DESC LIMIT ?)
+            """, (max_entries,))
+
+    def cache_clear(self):
+        with self.conn:
+            self.conn.execute("DELETE FROM result_cache")
+
+    def latest_run_id(self):
+        self.cursor.execute("SELECT MAX(id) FROM schedule_runs")
+        return self.cursor.fetchone()[0]
+
+    def fetch_schedule(self, run_id):
+        # (day, slot, section_id, subject_id, teacher_id, room_id) rows of a run
+        self.cursor.execute("""
+            SELECT day, slot, section_id, subject_id, teacher_id, room_id
+            FROM schedule_entries WHERE run_id=? ORDER BY section_id, day, slot
+        """, (run_id,))
+        return self.cursor.fetchall()
+
+    def room_occupant(self, run_id, room_id, day, slot):
+        # (section_id, subject_id, teacher_id) in the room at that slot, or None
+        self.cursor.execute("""
+            SELECT section_id, subject_id, teacher_id FROM schedule_entries
+            WHERE run_id=? AND room_id=? AND day=? AND slot=?
+        """, (run_id, room_id, day, slot))
+        return self.cursor.fetchone()
+
+    def teacher_week(self, run_id, teacher_id):
+        # (day, slot, section_id, subject_id, room_id) rows of one teacher, in time order
+        self.cursor.execute("""
+            SELECT day, slot, section_id, subject_id, room_id FROM schedule_entries
+            WHERE run_id=? AND teacher_id=? ORDER BY day, slot
+        """, (run_id, teacher_id))
+        return self.cursor.fetchall()
+
+# --- BULK IMPORT ---
+ImportReport = namedtuple("ImportReport", "table inserted duplicates errors")
+
+
+def _text(row, *names, required=True):
+    for name in names:
+        value = row.get(name)
+        if value is not None and str(value).strip():
+            return str(value).strip()
+    if required:
+        raise ValueError(f"missing {names[0]}")
+    return ""
+
+
+def _number(row, *names):
+    value = _text(row, *names)
+    try:
+        number = float(value)
+    except ValueError:
+        raise ValueError(f"{names[0]} must be a whole number, got {value!r}")
+    if number != int(number) or number < 0:
+        raise ValueError(f"{names[0]} must be a whole number, got {value!r}")
+    return int(number)
+
+
+def _optional_number(row, *names):
+    return _number(row, *names) if _text(row, *names, required=False) else None
+
+
+def _flag(row, *names):
+    value = _text(row, *names, required=False).lower()
+    if value in ("", "0", "no", "n", "false"):
+        return 0
+    if value in ("1", "yes", "y", "true", "x"):
+        return 1
+    raise ValueError(f"{names[0]} must be yes or no, got {value!r}")
+
+
+def _time(row, *names):
+    # "HH:MM" (24-hour) from "9:30", "09.30", "9:30:00" or an Excel time cell
+    value = next((row[name] for name in names if row.get(name) is not None and str(row[name]).strip()), None)
+    if hasattr(value, "strftime"):
+        return value.strftime("%H:%M")
+    text = _text(row, *names).replace(".", ":")
+    parts = text.split(":")
+    try:
+        hours, minutes = int(parts[0]), int(parts[1]) if len(parts) > 1 else 0
+    except ValueError:
+        raise ValueError(f"{names[0]} must be a time like 09:30, got {text!r}")
+    if not (0 <= hours < 24 and 0 <= minutes < 60) or len(parts) > 3:
+        raise ValueError(f"{names[0]} must be a time like 09:30, got {text!r}")
+    return f"{hours:02d}:{minutes:02d}"
+
+
+def _slot_times(row):
+    start, end = _time(row, "start", "start_time", "start time", "from"), _time(row, "end", "end_time", "end time", "to")
+    if end <= start:
+        raise ValueError(f"slot ends ({end}) before it starts ({start})")
+    return start, end
+
+
+def _choice(row, options, *names):
+    value = _text(row, *names)
+    for option in options:
+        if value.lower() == option.lower():
+            return option
+    raise ValueError(f"{names[0]} must be one of {', '.join(options)}, got {value!r}")
+
+
+# Per table: insert columns, the UNIQUE column(s) used for de-duplication, a
+# parser turning a header->value row into insert values (raises ValueError)
+# and, for mapping tables, which columns are looked up by code/name ("check"
+# builds a validator that sees the rows accepted so far). Tables are imported
+# in this order so a workbook can hold teachers and their subjects, or shifts
+# and the sections in them.
+IMPORT_SPECS = {
+    "teachers": {
+        "columns": ["name", "code"], "key": "code",
+        "parse": lambda r: (_text(r, "name"), _text(r, "code")),
+    },
+    "subjects": {
+        "columns": ["name", "code", "type", "hours_per_week"], "key": "code",
+        "parse": lambda r: (_text(r, "name"), _text(r, "code"), _choice(r, ["Theory", "Lab"], "type"),
+                            _number(r, "hours_per_week", "hours", "hrs/week")),
+    },
+    "rooms": {
+        "columns": ["name", "capacity", "type"], "key": "name",
+        "parse": lambda r: (_text(r, "name", "room no"), _number(r, "capacity"),
+                            _choice(r, ["Lecture Hall", "Lab"], "type")),
+    },
+    "shifts": {
+        "columns": ["name"], "key": "name",
+        "parse": lambda r: (_text(r, "name", "shift"),),
+    },
+    "calendar_days": {
+        "columns": ["name", "position"], "key": "name",
+        "parse": lambda r: (_text(r, "name", "day"), _optional_number(r, "position", "order")),
+    },
+    "calendar_slots": {
+        "columns": ["shift_id", "start_time", "end_time", "is_break"], "key": "shift_id start_time",
+        "refs": {"shift_id": ("shifts", "name")},
+        "parse": lambda r: (_text(r, "shift", "shift_id"),) + _slot_times(r) + (_flag(r, "break", "is_break"),),
+        "check": lambda db, record_id=None: db.slot_checker(record_id),
+    },
+    "sections": {
+        "columns": ["name", "strength", "shift_id"], "key": "name",
+        "refs": {"shift_id": ("shifts", "name")},
+        "parse": lambda r: (_text(r, "name", "section name"), _optional_number(r, "strength", "students"),
+                            _text(r, "shift", "shift_id", required=False) or None),
+    },
+    "teacher_subjects": {
+        "columns": ["teacher_id", "subject_id"], "key": "teacher_id subject_id",
+        "refs": {"teacher_id": ("teachers", "code"), "subject_id": ("subjects", "code")},
+        "parse": lambda r: (_text(r, "teacher", "teacher code"), _text(r, "subject", "subject code")),
+    },
+    "section_subjects": {
+        "columns": ["section_id", "subject_id"], "key": "section_id subject_id",
+        "refs": {"section_id": ("sections", "name"), "subject_id": ("subjects", "code")},
+        "parse": lambda r: (_text(r, "section", "section name"), _text(r, "subject", "subject code")),
+    },
+}
+IMPORT_ALIASES = {"faculty": "teachers", "teacher": "teachers", "subject": "subjects",
+                  "room": "rooms", "section": "sections",
+                  "teacher subjects": "teacher_subjects", "faculty subjects": "teacher_subjects",
+                  "section subjects": "section_subjects", "curriculum": "section_subjects",
+                  "shift": "shifts", "days": "calendar_days", "calendar days": "calendar_days",
+                  "slots": "calendar_slots", "calendar slots": "calendar_slots", "periods": "calendar_slots"}
+
+# Columns the list views search on (prefix match, backed by NOCASE indexes)
+SEARCH_COLUMNS = {"teachers": ("name", "code"), "subjects": ("name", "code"), "rooms": ("name",),
+                  "sections": ("name",)}
+
+
+def search_clause(table, search):
+    # (" WHERE ...", params) matching rows whose search columns start with `search`
+    if not search:
+        return "", ()
+    pattern = search.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+    columns = SEARCH_COLUMNS[table]
+    return " WHERE " + " OR ".join(f"{column} LIKE ? ESCAPE '\\'" for column in columns), (pattern,) * len(columns)
+
+
+# Mapping rows removed together with the record they point at
+MAPPING_REFS = {"teachers": [("teacher_subjects", "teacher_id")],
+                "subjects": [("teacher_subjects", "subject_id"), ("section_subjects", "subject_id")],
+                "sections": [("section_subjects", "section_id")],
+                "shifts": [("calendar_slots", "shift_id")]}
+# References set to NULL when the record they point at is removed
+NULLED_REFS = {"shifts": [("sections", "shift_id")]}
+
+
+def import_table_name(name):
+    name = " ".join(name.strip().lower().replace("_", " ").replace("-", " ").split())
+    name = IMPORT_ALIASES.get(name, name.replace(" ", "_"))
+    return name if name in IMPORT_SPECS else None
+
+
+def read_import_rows(path, sheet=None):
+    # Streams (line number, {lower-case header: value}) from a .csv file or one
+    # sheet of an .xlsx workbook (opened read-only); the first row is the header
+    if path.lower().endswith(".csv"):
+        with open(path, newline="", encoding="utf-8-sig") as f:
+            reader = csv.reader(f)
+            header = [h.strip().lower() for h in next(reader, [])]
+            for line_no, values in enumerate(reader, start=2):
+                if any(v.strip() for v in values):
+                    yield line_no, dict(zip(header, values))
+        return
+
+    wb = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = wb[sheet].iter_rows(values_only=True) if sheet else wb.active.iter_rows(values_only=True)
+        header = [str(h).strip().lower() if h is not None else "" for h in next(rows, ())]
+        for line_no, values in enumerate(rows, start=2):
+            if any(v is not None and str(v).strip() for v in values):
+                yield line_no, dict(zip(header, values))
+    finally:
+        wb.close()
+
+
+def import_file(db, path, table=None):
+    # Imports a .csv (into `table`, or the table named by the file) or an .xlsx
+    # workbook (into `table`, or every sheet named after a table such as
+    # "Faculty" or "Rooms"). Returns one ImportReport per table loaded.
+    if path.lower().endswith(".csv"):
+        table = table or import_table_name(os.path.splitext(os.path.basename(path))[0])
+        if table is None:
+            raise ValueError("Cannot tell which table this CSV file is for.")
+        return [db.import_rows(table, read_import_rows(path))]
+
+    wb = openpyxl.load_workbook(path, read_only=True)
+    sheets = [(name, import_table_name(name)) for name in wb.sheetnames]
+    wb.close()
+    if table:
+        # The sheet named after the table if there is one, else the first sheet
+        sheet = next((name for name, target in sheets if target == table), None)
+        return [db.import_rows(table, read_import_rows(path, sheet))]
+    order = list(IMPORT_SPECS)
+    sheets = sorted(((name, target) for name, target in sheets if target), key=lambda sheet: order.index(sheet[1]))
+    reports = [db.import_rows(target, read_import_rows(path, name)) for name, target in sheets]
+    if not reports:
+        raise ValueError("No sheet is named Teachers, Subjects, Rooms, Sections, Teacher Subjects, Section Subjects, "
+                         "Shifts, Calendar Days or Calendar Slots.")
+    return reports
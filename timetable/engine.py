@@ -0,0 +1,1762 @@
+import cProfile
+import hashlib
+import io
+import json
+import math
+import multiprocessing
+import os
+import pstats
+import random
+import threading
+import time
+import zlib
+from collections import Counter, namedtuple
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+from .export import write_view_workbook
+from .validate import validate_schedule
+
+# --- OCCUPANCY INDEX ---
+class OccupancyGrid:
+    # Busy state for every (day, slot) cell, stored as integer bitmasks with one
+    # bit per section / teacher / room. Days and slots are plain integer indices,
+    # so checking a whole lab block (or every teacher at once) is a few bitwise
+    # operations instead of list membership scans.
+    def __init__(self, n_days, n_slots, section_ids, teacher_ids, room_ids):
+        self.n_days = n_days
+        self.n_slots = n_slots
+
+        self.section_ids = list(section_ids)
+        self.teacher_ids = list(teacher_ids)
+        self.room_ids = list(room_ids)
+        self.section_bit = {sid: 1 << i for i, sid in enumerate(self.section_ids)}
+        self.teacher_bit = {tid: 1 << i for i, tid in enumerate(self.teacher_ids)}
+        self.room_bit = {rid: 1 << i for i, rid in enumerate(self.room_ids)}
+        self.all_teachers = (1 << len(self.teacher_ids)) - 1
+        self.all_rooms = (1 << len(self.room_ids)) - 1
+
+        # Flat arrays indexed by day * n_slots + slot
+        cells = n_days * n_slots
+        self.section_busy = [0] * cells
+        self.teacher_busy = [0] * cells
+        self.room_busy = [0] * cells
+
+    def _block_mask(self, busy, day, start, length):
+        base = day * self.n_slots + start
+        mask = 0
+        for c in range(base, base + length):
+            mask |= busy[c]
+        return mask
+
+    def is_free(self, day, start, length, sec_id, teacher_id, room_id):
+        s_bit = self.section_bit[sec_id]
+        t_bit = self.teacher_bit[teacher_id]
+        r_bit = self.room_bit[room_id]
+        base = day * self.n_slots + start
+        for c in range(base, base + length):
+            if self.section_busy[c] & s_bit or self.teacher_busy[c] & t_bit or self.room_busy[c] & r_bit:
+                return False
+        return True
+
+    def section_free(self, day, start, length, sec_id):
+        return not self._block_mask(self.section_busy, day, start, length) & self.section_bit[sec_id]
+
+    def free_teachers(self, day, start, length, candidates=None):
+        # Mask of teachers idle for the whole block (optionally limited to candidates)
+        pool = self.all_teachers if candidates is None else candidates
+        return pool & ~self._block_mask(self.teacher_busy, day, start, length)
+
+    def free_rooms(self, day, start, length, candidates=None):
+        pool = self.all_rooms if candidates is None else candidates
+        return pool & ~self._block_mask(self.room_busy, day, start, length)
+
+    def occupy(self, day, start, length, sec_id, teacher_id, room_id):
+        s_bit = self.section_bit[sec_id]
+        t_bit = self.teacher_bit[teacher_id]
+        r_bit = self.room_bit[room_id]
+        base = day * self.n_slots + start
+        for c in range(base, base + length):
+            self.section_busy[c] |= s_bit
+            self.teacher_busy[c] |= t_bit
+            self.room_busy[c] |= r_bit
+
+    def release(self, day, start, length, sec_id, teacher_id, room_id):
+        s_bit = ~self.section_bit[sec_id]
+        t_bit = ~self.teacher_bit[teacher_id]
+        r_bit = ~self.room_bit[room_id]
+        base = day * self.n_slots + start
+        for c in range(base, base + length):
+            self.section_busy[c] &= s_bit
+            self.teacher_busy[c] &= t_bit
+            self.room_busy[c] &= r_bit
+
+    def reassign_teacher(self, day, start, length, old_id, new_id):
+        base = day * self.n_slots + start
+        for c in range(base, base + length):
+            self.teacher_busy[c] = self.teacher_busy[c] & ~self.teacher_bit[old_id] | self.teacher_bit[new_id]
+
+    def reassign_room(self, day, start, length, old_id, new_id):
+        base = day * self.n_slots + start
+        for c in range(base, base + length):
+            self.room_busy[c] = self.room_busy[c] & ~self.room_bit[old_id] | self.room_bit[new_id]
+
+    def block_teacher(self, teacher_id, day):
+        # Marks a teacher busy for a whole day (leave, duty elsewhere)
+        for c in range(day * self.n_slots, (day + 1) * self.n_slots):
+            self.teacher_busy[c] |= self.teacher_bit[teacher_id]
+
+    def block_section(self, sec_id, slot_mask):
+        # Marks a section busy at the slots of `slot_mask` on every day (outside its shift)
+        for day in range(self.n_days):
+            for slot in iter_bits(slot_mask):
+                self.section_busy[day * self.n_slots + slot] |= self.section_bit[sec_id]
+
+    def block_room(self, room_id):
+        for c in range(self.n_days * self.n_slots):
+            self.room_busy[c] |= self.room_bit[room_id]
+
+    def teachers_in(self, mask):
+        return [self.teacher_ids[i] for i in iter_bits(mask)]
+
+    def rooms_in(self, mask):
+        return [self.room_ids[i] for i in iter_bits(mask)]
+
+
+def iter_bits(mask):
+    # Yields the index of every set bit, lowest first
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+# --- CALENDAR ---
+DEFAULT_DAYS = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday")
+DEFAULT_SLOTS = (("13:10", "14:00"), ("14:00", "14:50"), ("14:50", "15:40"), ("15:40", "16:30"),
+                 ("16:30", "17:15"), ("17:15", "18:00"))
+# Headers of the default week, as the app has always written them
+DEFAULT_SLOT_LABELS = ("1 (1.10-2.00)", "2 (2.00-2.50)", "3 (2.50-3.40)", "4 (3.40-4.30)", "5 (4.30-5.15)",
+                       "6 (5.15-6.00)")
+
+
+class Calendar:
+    # The week as dense integer indices: day d, period s. The periods are the
+    # teaching slots of every shift merged in time order (equal start and end
+    # in two shifts is one period), so shifts with different slot grids share
+    # one OccupancyGrid and a teacher working in both is never double booked.
+    # Slots of different shifts must match or be apart, not partly overlap.
+    # Breaks are not periods; they only stop a block (a Lab) from running
+    # across them. Names and times become labels for display and export only.
+    def __init__(self, days=(), shifts=(), slots=()):
+        # days: names in order; shifts: (id, name) rows; slots: (shift id,
+        # start, end, is_break) rows with "HH:MM" times, as DatabaseManager.
+        # fetch_calendar returns them. Without days / teaching slots the
+        # default week (six days, one shift of six slots) is used.
+        self.days = list(days) or list(DEFAULT_DAYS)
+        self.shift_names = dict(shifts)
+        teaching = [(shift, start, end) for shift, start, end, is_break in slots
+                    if not is_break and shift in self.shift_names]
+        self.default_week = not teaching
+        if not teaching:
+            self.shift_names = {None: "Default"}
+            teaching = [(None, start, end) for start, end in DEFAULT_SLOTS]
+        self.periods = sorted({(start, end) for _, start, end in teaching})
+        for (start, end), (next_start, next_end) in zip(self.periods, self.periods[1:]):
+            if next_start < end:
+                raise ValueError(f"Calendar slots {start}-{end} and {next_start}-{next_end} overlap.")
+        self.n_days, self.n_slots = len(self.days), len(self.periods)
+
+        index = {period: i for i, period in enumerate(self.periods)}
+        self.shift_slots = {}  # shift id -> bitmask of its periods
+        for shift, start, end in teaching:
+            self.shift_slots[shift] = self.shift_slots.get(shift, 0) | 1 << index[start, end]
+        self.default_shift = next(iter(self.shift_slots))
+        self.split_after = {}  # shift id -> bitmask of periods followed by one of its breaks
+        for shift, start, end, is_break in slots:
+            if is_break and shift in self.shift_slots:
+                for i, ((_, end_i), (start_next, _)) in enumerate(zip(self.periods, self.periods[1:])):
+                    if end_i <= start and end <= start_next:
+                        self.split_after[shift] = self.split_after.get(shift, 0) | 1 << i
+        self._starts = {}
+
+    def shift_of(self, shift_id):
+        # Sections without a shift (or in one with no slots yet) follow the first shift
+        return shift_id if shift_id in self.shift_slots else self.default_shift
+
+    def start_mask(self, shift, length):
+        # Bitmask of the periods a block of `length` may start at in the shift:
+        # all of its periods belong to the shift and no break falls inside it
+        if (shift, length) not in self._starts:
+            periods, split = self.shift_slots[shift], self.split_after.get(shift, 0)
+            block, inner = (1 << length) - 1, (1 << (length - 1)) - 1
+            mask = 0
+            for start in range(self.n_slots - length + 1):
+                if periods >> start & block == block and not split >> start & inner:
+                    mask |= 1 << start
+            self._starts[shift, length] = mask
+        return self._starts[shift, length]
+
+    @property
+    def slot_labels(self):
+        if self.default_week:
+            return list(DEFAULT_SLOT_LABELS)
+        return [f"{i + 1} ({start}-{end})" for i, (start, end) in enumerate(self.periods)]
+
+    def spec(self):
+        # Plain data that identifies the calendar (part of the result cache key)
+        return [self.days, self.periods, sorted(self.shift_slots.items(), key=str),
+                sorted(self.split_after.items(), key=str)]
+
+
+def idle_periods(mask, periods):
+    # Periods of `periods` between the first and last set bit of `mask` that
+    # are not set in it: a section's idle gaps in one day
+    if not mask:
+        return 0
+    return (((1 << mask.bit_length()) - (mask & -mask)) & periods & ~mask).bit_count()
+
+
+# --- PROBLEM MODEL ---
+# One schedulable block: a Theory hour (length 1) or a Lab session (length 2) of
+# a subject for a section. teacher_pool / room_pool are bitmasks (OccupancyGrid
+# bit order) of the resources allowed to take it.
+Lesson = namedtuple("Lesson", "section_id subject_id length teacher_pool room_pool")
+Placement = namedtuple("Placement", "lesson day start teacher_id room_id")
+
+
+class TimetableProblem:
+    # Plain-data snapshot of everything the solvers need, compiled once per run.
+    # teacher_subjects / section_subjects are (teacher, subject) and (section,
+    # subject) id pairs from the eligibility tables; they are turned into the
+    # per-lesson teacher and room pools here, so the solvers only ever pick from
+    # qualified teachers and rooms that fit the section. Each section only gets
+    # the periods of its shift (calendar.start_mask); new_grid blocks the rest.
+    def __init__(self, calendar, teachers, subjects, rooms, sections, teacher_subjects=(), section_subjects=()):
+        self.calendar = calendar
+        self.n_days, self.n_slots = calendar.n_days, calendar.n_slots
+        self.teachers = {t[0]: t for t in teachers}
+        self.subjects = {s[0]: s for s in subjects}
+        self.rooms = {r[0]: r for r in rooms}
+        self.sections = {s[0]: s for s in sections}
+        self.eligibility = (sorted(teacher_subjects), sorted(section_subjects))
+        self.section_shift = {sec_id: calendar.shift_of(s[3] if len(s) > 3 else None)
+                              for sec_id, s in self.sections.items()}
+
+        probe = OccupancyGrid(self.n_days, self.n_slots, self.sections, self.teachers, self.rooms)
+        self.all_teachers = probe.all_teachers
+        self.teacher_bit = probe.teacher_bit
+        self.room_bit = probe.room_bit
+
+        # subject -> bitmask of qualified teachers; unmapped subjects are open to all
+        self.subject_teachers = {}
+        for teacher_id, sub_id in teacher_subjects:
+            if teacher_id in self.teachers and sub_id in self.subjects:
+                self.subject_teachers[sub_id] = self.subject_teachers.get(sub_id, 0) | probe.teacher_bit[teacher_id]
+
+        # section -> subject ids it takes; unmapped sections take every subject
+        self.section_subjects = {}
+        for sec_id, sub_id in section_subjects:
+            if sec_id in self.sections and sub_id in self.subjects:
+                self.section_subjects.setdefault(sec_id, []).append(sub_id)
+
+        self.room_pools = {}
+        for room_type in ("Lab", "Lecture Hall"):
+            pool = 0
+            for r in rooms:
+                if r[3] == room_type:
+                    pool |= probe.room_bit[r[0]]
+            self.room_pools[room_type] = pool or probe.all_rooms  # Fallback to any room
+        self.build_lessons()
+
+    def room_pool(self, room_type, strength):
+        # Rooms of the type that seat `strength` students (rooms with no capacity
+        # set always qualify); the whole type pool if none is big enough
+        pool = self.room_pools[room_type]
+        if not strength:
+            return pool
+        fitting = 0
+        for room_id in self.rooms:
+            bit = self.room_bit[room_id]
+            capacity = self.rooms[room_id][2]
+            if pool & bit and (capacity is None or capacity >= strength):
+                fitting |= bit
+        return fitting or pool
+
+    def build_lessons(self):
+        self.lessons = []
+        room_pools = {}  # (room type, strength) -> pool, shared by sections of one size
+        for sec_id, section in self.sections.items():
+            strength = section[2] if len(section) > 2 else None
+            sub_ids = self.section_subjects.get(sec_id) or list(self.subjects)
+            for sub_id in sub_ids:
+                _, _, _, sub_type, hours = self.subjects[sub_id]
+                length = 2 if sub_type == 'Lab' else 1
+                room_type = 'Lab' if sub_type == 'Lab' else 'Lecture Hall'
+                if (room_type, strength) not in room_pools:
+                    room_pools[room_type, strength] = self.room_pool(room_type, strength)
+                teachers = self.subject_teachers.get(sub_id, self.all_teachers)
+                blocks = -(-hours // length)
+                self.lessons.extend([Lesson(sec_id, sub_id, length, teachers, room_pools[room_type, strength])] * blocks)
+        self.lesson_index = {(l.section_id, l.subject_id): l for l in self.lessons}
+
+    def set_hours(self, subject_hours):
+        # Overrides hours_per_week for some subjects and rebuilds the lesson list
+        for sub_id, hours in subject_hours.items():
+            self.subjects[sub_id] = self.subjects[sub_id][:4] + (hours,)
+        self.build_lessons()
+
+    def fingerprint(self, **config):
+        # Content hash of the input data plus the solver settings in `config`:
+        # equal fingerprints mean a solve would see exactly the same problem
+        data = [self.calendar.spec()] + [sorted(rows.values()) for rows in
+                                         (self.teachers, self.subjects, self.rooms, self.sections)]
+        data += [self.eligibility, sorted(config.items())]
+        return hashlib.sha256(json.dumps(data, default=str).encode()).hexdigest()
+
+    def new_grid(self):
+        grid = OccupancyGrid(self.n_days, self.n_slots, self.sections, self.teachers, self.rooms)
+        all_slots = (1 << self.n_slots) - 1
+        for sec_id, shift in self.section_shift.items():
+            if self.calendar.shift_slots[shift] != all_slots:
+                grid.block_section(sec_id, all_slots & ~self.calendar.shift_slots[shift])
+        return grid
+
+    def start_mask(self, sec_id, length):
+        # Slot bitmask of where the section may start a block of `length`
+        return self.calendar.start_mask(self.section_shift[sec_id], length)
+
+    def shift_periods(self, sec_id):
+        return self.calendar.shift_slots[self.section_shift[sec_id]]
+
+    def partitions(self, lessons=None):
+        # Lessons split into groups that can never compete for a teacher:
+        # union-find joins a section with every teacher allowed to take one of
+        # its lessons, so departments with their own staff (per teacher_subjects)
+        # fall apart while any subject open to all teachers joins everything.
+        # Rooms are shared by every group. Largest group first.
+        lessons = self.lessons if lessons is None else lessons
+        parent = {}
+
+        def find(node):
+            root = node
+            while parent.get(root, root) != root:
+                root = parent[root]
+            while node != root:  # Path compression
+                parent[node], node = root, parent[node]
+            return root
+
+        for sec_id, pool in {(l.section_id, l.teacher_pool) for l in lessons}:
+            root = find(("section", sec_id))
+            for idx in iter_bits(pool):
+                other = find(("teacher", idx))
+                if other != root:
+                    parent[other] = root
+        groups = {}
+        for lesson in lessons:
+            groups.setdefault(find(("section", lesson.section_id)), []).append(lesson)
+        return sorted(groups.values(), key=self.total_hours, reverse=True)
+
+    def allot_rooms(self, parts):
+        # Copies of the lesson groups whose room pools are cut down to a share
+        # of the rooms, in proportion to each group's hours per room type, so
+        # groups solved apart rarely pick the same room at the same time. A
+        # lesson none of whose fitting rooms is in its share keeps its full pool.
+        demand = [Counter() for _ in parts]
+        for i, lessons in enumerate(parts):
+            for lesson in lessons:
+                demand[i][self.subjects[lesson.subject_id][3] == 'Lab'] += lesson.length
+        shares = [0] * len(parts)
+        for is_lab, room_type in ((True, "Lab"), (False, "Lecture Hall")):
+            total = sum(d[is_lab] for d in demand)
+            if not total:
+                continue
+            # Biggest rooms first, each to the group furthest below its share
+            room_ids = sorted((r for r in self.rooms if self.room_pools[room_type] & self.room_bit[r]),
+                              key=lambda r: -(self.rooms[r][2] or 0))
+            given = [0] * len(parts)
+            for room_id in room_ids:
+                i = max(range(len(parts)), key=lambda i: demand[i][is_lab] / total * len(room_ids) - given[i])
+                given[i] += 1
+                shares[i] |= self.room_bit[room_id]
+        return [[lesson._replace(room_pool=lesson.room_pool & share or lesson.room_pool) for lesson in lessons]
+                for lessons, share in zip(parts, shares)]
+
+    def total_hours(self, lessons=None):
+        return sum(l.length for l in (self.lessons if lessons is None else lessons))
+
+
+# --- SOLVER ENGINES ---
+class SolverMonitor:
+    # Shared between a running solve and whoever watches it (e.g. the GUI
+    # thread): the solver posts progress and polls `cancelled`; the watcher
+    # reads snapshot() and may cancel(). A cancelled solver stops cleanly and
+    # returns the best result it has. cancel_event may be a multiprocessing
+    # Event, so solves in worker processes see the same cancel.
+    def __init__(self, cancel_event=None):
+        self._cancel = cancel_event or threading.Event()
+        self._lock = threading.Lock()
+        self._progress = {"sections_done": 0, "sections_total": 0, "placed_hours": 0, "total_hours": 0,
+                          "best": None, "attempts": 0}
+
+    def cancel(self):
+        self._cancel.set()
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    def child(self):
+        # Monitor sharing this one's cancel but keeping its own progress
+        return SolverMonitor(self._cancel)
+
+    def update(self, **fields):
+        with self._lock:
+            self._progress.update(fields)
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self._progress)
+
+
+class SolverStats:
+    # Opt-in instrumentation for a run. Pass one to Scheduler.generate /
+    # generate_parallel / reschedule / export_to_excel and read it afterwards:
+    #   counters      attempts, placements, conflict_* reasons, dead_ends, restarts
+    #   timers        seconds per phase (fetch, solve, build, export)
+    #   dropped_*     unplaced hours per subject / section id, and why (drop_reasons)
+    # profile=True runs the solve phase under cProfile (profile_report holds the
+    # top functions; generate_parallel profiles each run in its worker and keeps
+    # the report of the kept run); hook(phase, seconds) is called after every phase.
+    def __init__(self, profile=False, hook=None):
+        self.counters = Counter()
+        self.timers = {}
+        self.dropped_by_subject = Counter()
+        self.dropped_by_section = Counter()
+        self.drop_reasons = Counter()
+        self.profile = profile
+        self.hook = hook
+        self.profile_report = None
+
+    @contextmanager
+    def phase(self, name):
+        profiler = cProfile.Profile() if self.profile and name == "solve" else None
+        if profiler:
+            profiler.enable()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            if profiler:
+                profiler.disable()
+                out = io.StringIO()
+                pstats.Stats(profiler, stream=out).sort_stats("cumulative").print_stats(25)
+                self.profile_report = out.getvalue()
+            self.add_time(name, elapsed)
+
+    def add_time(self, name, seconds):
+        self.timers[name] = self.timers.get(name, 0.0) + seconds
+        if self.hook:
+            self.hook(name, seconds)
+
+    def record_unplaced(self, problem, grid, unplaced):
+        # Attributes every dropped block to a cause, judged on the final grid:
+        # section_full (no free start left for the section), no_teacher / no_room
+        # (no free start has one), no_teacher_and_room (never both at once)
+        for lesson in unplaced:
+            self.dropped_by_subject[lesson.subject_id] += lesson.length
+            self.dropped_by_section[lesson.section_id] += lesson.length
+            starts = [(day, start) for day in range(problem.n_days)
+                      for start in iter_bits(problem.start_mask(lesson.section_id, lesson.length))
+                      if grid.section_free(day, start, lesson.length, lesson.section_id)]
+            with_teacher = [s for s in starts if grid.free_teachers(*s, lesson.length, lesson.teacher_pool)]
+            with_room = [s for s in starts if grid.free_rooms(*s, lesson.length, lesson.room_pool)]
+            if not starts:
+                reason = "section_full"
+            elif not with_teacher:
+                reason = "no_teacher"
+            elif not with_room:
+                reason = "no_room"
+            else:
+                reason = "no_teacher_and_room"
+            self.drop_reasons[reason] += lesson.length
+
+    def merge_counters(self, counters):
+        self.counters.update(counters)
+
+    def as_dict(self):
+        return {"counters": dict(self.counters), "timers": dict(self.timers),
+                "dropped_by_subject": dict(self.dropped_by_subject),
+                "dropped_by_section": dict(self.dropped_by_section), "drop_reasons": dict(self.drop_reasons),
+                "profile_report": self.profile_report}
+
+    def summary(self, problem=None):
+        # Human readable report; subject/section names are used when problem is given
+        lines = ["Phases: " + ", ".join(f"{name} {secs:.3f}s" for name, secs in self.timers.items())]
+        if self.counters:
+            lines.append("Counters: " + ", ".join(f"{k} {v}" for k, v in sorted(self.counters.items())))
+        if self.drop_reasons:
+            lines.append("Dropped hours by cause: " + ", ".join(f"{k} {v}" for k, v in self.drop_reasons.most_common()))
+
+            def name_of(table, key):
+                row = getattr(problem, table).get(key) if problem else None
+                return row[1] if row else str(key)
+
+            lines.append("Dropped hours by subject: " + ", ".join(
+                f"{name_of('subjects', k)} {v}" for k, v in self.dropped_by_subject.most_common(10)))
+            lines.append("Dropped hours by section: " + ", ".join(
+                f"{name_of('sections', k)} {v}" for k, v in self.dropped_by_section.most_common(10)))
+        else:
+            lines.append("No hours dropped.")
+        return "\n".join(lines)
+
+
+class GreedySolver:
+    # "fast" mode: the original randomized greedy loop. Each subject gets up to
+    # 100 random (day, slot, teacher, room) guesses; whatever misses is dropped.
+    max_attempts = 100
+
+    def solve(self, problem, grid, lessons, rng, deadline=None, monitor=None, stats=None):
+        monitor = monitor or SolverMonitor()
+        placements = []
+        unplaced = []
+        n_days = problem.n_days
+
+        # Group the blocks of each (section, subject) and shuffle subjects within a section
+        by_section = {}
+        for lesson in lessons:
+            by_section.setdefault(lesson.section_id, {}).setdefault(lesson.subject_id, []).append(lesson)
+        monitor.update(sections_total=len(by_section), total_hours=problem.total_hours(lessons))
+        placed_hours = 0
+        guesses = 0
+
+        # Candidate teacher / room lists, built once per distinct pool
+        pools = {}
+
+        def pool_lists(lesson):
+            key = (lesson.teacher_pool, lesson.room_pool)
+            if key not in pools:
+                pools[key] = (grid.teachers_in(lesson.teacher_pool), grid.rooms_in(lesson.room_pool))
+            return pools[key]
+
+        for done, (sec_id, subject_blocks) in enumerate(by_section.items()):
+            if monitor.cancelled:
+                unplaced.extend(l for blocks in subject_blocks.values() for l in blocks)
+                continue
+            section_subjects = list(subject_blocks.values())
+            rng.shuffle(section_subjects)
+
+            for blocks in section_subjects:
+                teachers, valid_rooms = pool_lists(blocks[0])
+                starts = list(iter_bits(problem.start_mask(sec_id, blocks[0].length)))
+                placed = 0
+                attempts = 0 if starts else self.max_attempts
+                while placed < len(blocks) and attempts < self.max_attempts:
+                    lesson = blocks[placed]
+                    day = rng.randrange(n_days)
+                    start = rng.choice(starts)
+                    teacher_id = rng.choice(teachers)
+                    room_id = rng.choice(valid_rooms)
+                    guesses += 1
+
+                    if grid.is_free(day, start, lesson.length, sec_id, teacher_id, room_id):
+                        grid.occupy(day, start, lesson.length, sec_id, teacher_id, room_id)
+                        placements.append(Placement(lesson, day, start, teacher_id, room_id))
+                        placed_hours += lesson.length
+                        placed += 1
+                    else:
+                        attempts += 1
+                        if stats is not None:
+                            if not grid.section_free(day, start, lesson.length, sec_id):
+                                stats.counters["conflict_section"] += 1
+                            if not grid.free_teachers(day, start, lesson.length, grid.teacher_bit[teacher_id]):
+                                stats.counters["conflict_teacher"] += 1
+                            if not grid.free_rooms(day, start, lesson.length, grid.room_bit[room_id]):
+                                stats.counters["conflict_room"] += 1
+                unplaced.extend(blocks[placed:])
+            monitor.update(sections_done=done + 1, placed_hours=placed_hours, best=placed_hours, attempts=guesses)
+
+        if stats is not None:
+            stats.counters["attempts"] += guesses
+            stats.counters["placements"] += len(placements)
+        return placements, unplaced
+
+
+class BacktrackingSolver:
+    # Complete search over (day, start slot) for every lesson:
+    #   * most-constrained-first: always branch on the lesson with the fewest
+    #     feasible starts left,
+    #   * forward checking: candidate starts are kept as cell bitmasks
+    #     (bit = day * n_slots + slot) so every domain is recomputed with a few
+    #     bitwise ops after each move, and a wiped-out domain backtracks at once,
+    #   * chronological backtracking with restarts, bounded by a time budget;
+    #     when the budget runs out the fullest assignment seen is returned.
+    # Teacher and room are picked per move from the grid's free masks. When no
+    # single teacher (room) is idle for a whole lab block, the lessons blocking
+    # one of them are handed to other idle teachers (rooms) first.
+
+    restart_after = 100  # dead ends before the first restart (doubles each time)
+
+    def __init__(self, time_budget=10.0):
+        self.time_budget = time_budget
+
+    def solve(self, problem, grid, lessons, rng, deadline=None, monitor=None, stats=None):
+        monitor = monitor or SolverMonitor()
+        counters = stats.counters if stats is not None else Counter()
+        if deadline is None:
+            deadline = time.monotonic() + self.time_budget
+        n_slots = problem.n_slots
+        n_cells = problem.n_days * n_slots
+
+        # Start masks per (section, length): the shift's valid starts repeated
+        # every day, so a block never spills into the next day or over a break
+        start_ok = {}
+        for lesson in lessons:
+            key = (lesson.section_id, lesson.length)
+            if key not in start_ok:
+                slot_mask = problem.start_mask(*key)
+                start_ok[key] = sum(slot_mask << (day * n_slots) for day in range(problem.n_days))
+
+        # Free cells per section, and cells where each resource pool still has a free member
+        sec_free = {}
+        for sec_id, bit in grid.section_bit.items():
+            sec_free[sec_id] = sum(1 << c for c in range(n_cells) if not grid.section_busy[c] & bit)
+        pool_cells = {}
+        for lesson in lessons:
+            pool_cells.setdefault(("teacher", lesson.teacher_pool), 0)
+            pool_cells.setdefault(("room", lesson.room_pool), 0)
+        busy_of = {"teacher": grid.teacher_busy, "room": grid.room_busy}
+
+        def refresh_cells(cells):
+            for (kind, pool), mask in pool_cells.items():
+                busy = busy_of[kind]
+                for c in cells:
+                    if busy[c] & pool == pool:
+                        mask &= ~(1 << c)
+                    else:
+                        mask |= 1 << c
+                pool_cells[(kind, pool)] = mask
+
+        refresh_cells(range(n_cells))
+
+        def key_of(lesson):
+            return (lesson.section_id, lesson.length, lesson.teacher_pool, lesson.room_pool)
+
+        def domain(key):
+            sec_id, length, t_pool, r_pool = key
+            avail = sec_free[sec_id] & pool_cells[("teacher", t_pool)] & pool_cells[("room", r_pool)]
+            starts = avail
+            for k in range(1, length):
+                starts &= avail >> k
+            return starts & start_ok[sec_id, length]
+
+        # Identical blocks share a domain, so the search works on groups of them
+        groups = {}
+        for lesson in lessons:
+            groups.setdefault(key_of(lesson), []).append(lesson)
+
+        unplaced = []
+        for key in list(groups):
+            if not domain(key):
+                unplaced.extend(groups.pop(key))
+        remaining_hours = {}
+        for key, members in groups.items():
+            remaining_hours[key[0]] = remaining_hours.get(key[0], 0) + key[1] * len(members)
+        sections = {lesson.section_id for lesson in lessons}
+        placeable_hours = sum(remaining_hours.values())
+        monitor.update(sections_total=len(sections), total_hours=problem.total_hours(lessons))
+
+        day_load = {}      # (section, subject, day) -> blocks placed, used to spread repeats
+        pair_load = {}     # (section, subject) -> blocks placed
+        teacher_load = {}
+        teacher_for = {}   # (section, subject) -> teacher already teaching it
+        holder = {}        # (kind, resource id, cell) -> frame whose placement uses it
+
+        def commit(frame, placement):
+            lesson, day, start, teacher_id, room_id = placement
+            length = lesson.length
+            cell = day * n_slots + start
+            grid.occupy(day, start, length, lesson.section_id, teacher_id, room_id)
+            groups[frame[0]].remove(lesson)
+            sec_free[lesson.section_id] &= ~(((1 << length) - 1) << cell)
+            remaining_hours[lesson.section_id] -= length
+            refresh_cells(range(cell, cell + length))
+            for c in range(cell, cell + length):
+                holder[("teacher", teacher_id, c)] = frame
+                holder[("room", room_id, c)] = frame
+            pair = (lesson.section_id, lesson.subject_id)
+            day_load[pair + (day,)] = day_load.get(pair + (day,), 0) + 1
+            pair_load[pair] = pair_load.get(pair, 0) + 1
+            teacher_load[teacher_id] = teacher_load.get(teacher_id, 0) + length
+            teacher_for.setdefault(pair, teacher_id)
+            frame[2] = placement
+
+        def unplace(frame):
+            lesson, day, start, teacher_id, room_id = frame[2]
+            length = lesson.length
+            grid.release(day, start, length, lesson.section_id, teacher_id, room_id)
+            groups[frame[0]].append(lesson)
+            cell = day * n_slots + start
+            sec_free[lesson.section_id] |= ((1 << length) - 1) << cell
+            remaining_hours[lesson.section_id] += length
+            refresh_cells(range(cell, cell + length))
+            for c in range(cell, cell + length):
+                del holder[("teacher", teacher_id, c)]
+                del holder[("room", room_id, c)]
+            pair = (lesson.section_id, lesson.subject_id)
+            day_load[pair + (day,)] -= 1
+            pair_load[pair] -= 1
+            teacher_load[teacher_id] -= length
+            if not pair_load[pair]:
+                teacher_for.pop(pair, None)
+            frame[2] = None
+
+        def reassign(kind, frame, new_id):
+            placement = frame[2]
+            lesson, day, start = placement.lesson, placement.day, placement.start
+            cell = day * n_slots + start
+            if kind == "teacher":
+                old_id = placement.teacher_id
+                grid.reassign_teacher(day, start, lesson.length, old_id, new_id)
+                teacher_load[old_id] -= lesson.length
+                teacher_load[new_id] = teacher_load.get(new_id, 0) + lesson.length
+                frame[2] = placement._replace(teacher_id=new_id)
+            else:
+                old_id = placement.room_id
+                grid.reassign_room(day, start, lesson.length, old_id, new_id)
+                frame[2] = placement._replace(room_id=new_id)
+            for c in range(cell, cell + lesson.length):
+                del holder[(kind, old_id, c)]
+                holder[(kind, new_id, c)] = frame
+
+        def free_by_swap(kind, day, start, length, pool):
+            # Bit of a resource freed for the whole block by moving its other
+            # lessons inside the block to alternative idle resources, or 0
+            if kind == "teacher":
+                ids, busy, free_of = grid.teacher_ids, grid.teacher_busy, grid.free_teachers
+            else:
+                ids, busy, free_of = grid.room_ids, grid.room_busy, grid.free_rooms
+            base = day * n_slots + start
+            partly_free = 0
+            for c in range(base, base + length):
+                partly_free |= pool & ~busy[c]
+            for idx in iter_bits(partly_free):
+                blocking = []
+                for c in range(base, base + length):
+                    if busy[c] >> idx & 1:
+                        frame = holder.get((kind, ids[idx], c))
+                        if frame is None:
+                            break  # Held by a fixed (pre-occupied) lesson
+                        if frame not in blocking:
+                            blocking.append(frame)
+                else:
+                    plan = []
+                    for frame in blocking:
+                        p = frame[2]
+                        alt = free_of(p.day, p.start, p.lesson.length,
+                                      p.lesson.teacher_pool if kind == "teacher" else p.lesson.room_pool)
+                        if not alt:
+                            break
+                        plan.append((frame, ids[next(iter_bits(alt))]))
+                    else:
+                        for frame, new_id in plan:
+                            reassign(kind, frame, new_id)
+                        counters[f"swaps_{kind}"] += 1
+                        return 1 << idx
+            return 0
+
+        attempts = 0
+
+        def place(frame, cell):
+            nonlocal attempts
+            attempts += 1
+            lesson = groups[frame[0]][-1]
+            day, start = divmod(cell, n_slots)
+            length = lesson.length
+            teachers = grid.free_teachers(day, start, length, lesson.teacher_pool)
+            if not teachers:
+                teachers = free_by_swap("teacher", day, start, length, lesson.teacher_pool)
+            rooms = grid.free_rooms(day, start, length, lesson.room_pool)
+            if not rooms:
+                rooms = free_by_swap("room", day, start, length, lesson.room_pool)
+            if not teachers or not rooms:
+                if not teachers:
+                    counters["conflict_teacher"] += 1
+                if not rooms:
+                    counters["conflict_room"] += 1
+                return False
+            pair = (lesson.section_id, lesson.subject_id)
+            preferred = teacher_for.get(pair)
+            if preferred is not None and teachers & grid.teacher_bit[preferred]:
+                teacher_id = preferred
+            else:
+                teacher_id = min(grid.teachers_in(teachers), key=lambda t: (teacher_load.get(t, 0), rng.random()))
+            room_id = rng.choice(grid.rooms_in(rooms))
+            commit(frame, Placement(lesson, day, start, teacher_id, room_id))
+            return True
+
+        def select():
+            # (key, domain) of the most constrained open group; (None, 0) on a
+            # dead end; (None, None) once every group is placed
+            for sec_id, hours in remaining_hours.items():
+                if hours > sec_free[sec_id].bit_count():
+                    return None, 0
+            best_key, best_dom, best_rank = None, None, None
+            for key, members in groups.items():
+                if not members:
+                    continue
+                dom = domain(key)
+                slack = dom.bit_count() - len(members)
+                if slack < 0:
+                    return None, 0
+                rank = (slack, -key[1])
+                if best_rank is None or rank < best_rank:
+                    best_key, best_dom, best_rank = key, dom, rank
+            return best_key, best_dom
+
+        def ordered_values(key, dom):
+            # Least constraining first: cells with the most idle teachers/rooms,
+            # then days where this subject is not taught yet, random otherwise.
+            # Returned reversed so the stack can pop() the best candidate.
+            lesson = groups[key][-1]
+            values = []
+            for c in iter_bits(dom):
+                day, start = divmod(c, n_slots)
+                spare = min(grid.free_teachers(day, start, lesson.length, lesson.teacher_pool).bit_count(),
+                            grid.free_rooms(day, start, lesson.length, lesson.room_pool).bit_count())
+                repeats = day_load.get((lesson.section_id, lesson.subject_id, day), 0)
+                values.append((-spare, repeats, rng.random(), c))
+            values.sort(reverse=True)
+            return [v[-1] for v in values]
+
+        def unwind():
+            while stack:
+                frame = stack.pop()
+                if frame[2] is not None:
+                    unplace(frame)
+
+        stack = []  # frames: [key, untried cells, placement]
+        best = []
+        complete = False
+        dead_ends, restart_limit = 0, self.restart_after
+        steps = 0
+        while time.monotonic() <= deadline and not monitor.cancelled:
+            steps += 1
+            if steps % 50 == 0:
+                placed_hours = placeable_hours - sum(remaining_hours.values())
+                monitor.update(placed_hours=placed_hours, attempts=attempts,
+                               sections_done=len(sections) - sum(1 for h in remaining_hours.values() if h),
+                               best=max(placed_hours, sum(p.lesson.length for p in best)))
+            key, dom = select()
+            if key is None and dom is None:
+                complete = True
+                break
+            if key is not None:
+                stack.append([key, ordered_values(key, dom), None])
+            else:
+                if len(stack) > len(best):
+                    best = [frame[2] for frame in stack]
+                if not stack:
+                    break
+                dead_ends += 1
+                counters["dead_ends"] += 1
+                if dead_ends >= restart_limit:
+                    # Long dead-end streaks are cheaper to escape by restarting
+                    # (with fresh random tie-breaks) than by unwinding them
+                    unwind()
+                    dead_ends, restart_limit = 0, restart_limit * 2
+                    counters["restarts"] += 1
+                    continue
+                # Dead end: undo the latest move so its next value gets tried
+                unplace(stack[-1])
+
+            # Advance the top frame to its next workable value, popping exhausted frames
+            while stack:
+                frame = stack[-1]
+                while frame[1] and not place(frame, frame[1].pop()):
+                    pass
+                if frame[2] is not None:
+                    break
+                stack.pop()
+                if stack:
+                    unplace(stack[-1])
+            if not stack:
+                break  # Search space exhausted
+
+        if not complete:
+            if len(best) > len(stack):
+                # Fall back to the fullest assignment seen during the search
+                unwind()
+                for placement in best:
+                    frame = [key_of(placement.lesson), [], None]
+                    commit(frame, placement)
+                    stack.append(frame)
+
+            # Greedy completion of whatever is still open so the result stays dense
+            for key, members in groups.items():
+                while members:
+                    frame = [key, [], None]
+                    if not any(place(frame, cell) for cell in iter_bits(domain(key))):
+                        break
+                    stack.append(frame)
+
+        for members in groups.values():
+            unplaced.extend(members)
+        placed_hours = placeable_hours - sum(remaining_hours.values())
+        monitor.update(placed_hours=placed_hours, best=placed_hours, attempts=attempts,
+                       sections_done=len(sections) - sum(1 for h in remaining_hours.values() if h))
+        counters["attempts"] += attempts
+        counters["placements"] += len(stack)
+        if not complete:
+            counters["budget_exhausted" if time.monotonic() > deadline else "search_stopped"] += 1
+        return [frame[2] for frame in stack], unplaced
+
+
+SOLVERS = {
+    "fast": GreedySolver,
+    "backtrack": BacktrackingSolver,
+}
+
+
+def make_solver(mode, time_budget):
+    solver_cls = SOLVERS[mode]
+    if solver_cls is BacktrackingSolver:
+        return solver_cls(time_budget=time_budget)
+    return solver_cls()
+
+
+# --- SCORING ---
+# Lower is better, compared field by field: unplaced hours dominate, then
+# violations (double bookings, labs/lectures in the wrong room type), then idle
+# gaps inside a section's day.
+ScheduleScore = namedtuple("ScheduleScore", "unplaced_hours violations gaps")
+
+
+def score_placements(problem, placements, unplaced):
+    used = set()
+    violations = 0
+    section_days = {}
+    for p in placements:
+        lesson = p.lesson
+        wanted = 'Lab' if problem.subjects[lesson.subject_id][3] == 'Lab' else 'Lecture Hall'
+        if problem.rooms[p.room_id][3] != wanted:
+            violations += 1
+        for slot in range(p.start, p.start + lesson.length):
+            for key in (("s", lesson.section_id), ("t", p.teacher_id), ("r", p.room_id)):
+                if key + (p.day, slot) in used:
+                    violations += 1
+                used.add(key + (p.day, slot))
+            key = (lesson.section_id, p.day)
+            section_days[key] = section_days.get(key, 0) | 1 << slot
+
+    gaps = sum(idle_periods(mask, problem.shift_periods(sec_id)) for (sec_id, _), mask in section_days.items())
+    return ScheduleScore(problem.total_hours(unplaced), violations, gaps)
+
+
+# --- SOFT CONSTRAINT OPTIMIZER ---
+class ScheduleOptimizer:
+    # Simulated annealing over a feasible schedule. Moves shift one block to
+    # another free (day, start) or swap two same-length blocks of a section;
+    # every move is checked against the OccupancyGrid, so hard constraints are
+    # never broken. The weighted penalty is kept per (section, day), (teacher,
+    # day) and (section, subject, day), so a move is scored from the few terms
+    # it touches instead of re-scoring the timetable:
+    #   gaps     idle periods between a section's first and last lesson of a day
+    #   load     squared teaching hours of a teacher per day (spreads the week)
+    #   repeats  extra blocks of one subject on the same day for a section
+    #   labs     Lab blocks not starting on a slot pair of the shift (1-2, 3-4, ...)
+    # With max_moves the cooling follows the move count instead of the clock,
+    # so a seeded run is reproducible (time_budget=None then means no limit).
+    weights = {"gaps": 3, "load": 1, "repeats": 4, "labs": 1}
+    swap_rate = 0.4
+
+    def __init__(self, time_budget=2.0, weights=None, max_moves=None):
+        self.time_budget = time_budget
+        self.max_moves = max_moves
+        self.weights = dict(self.weights, **(weights or {}))
+
+    def optimize(self, problem, grid, placements, rng, monitor=None, stats=None, pinned=()):
+        # Returns the improved placements; `pinned` placements are never moved
+        monitor = monitor or SolverMonitor()
+        w_gap, w_load, w_rep, w_lab = (self.weights[k] for k in ("gaps", "load", "repeats", "labs"))
+        n_days = problem.n_days
+        pinned = set(pinned)
+        current = list(placements)
+        movable = [i for i, p in enumerate(current) if p not in pinned]
+        by_section = {}  # section -> {length: indices into current}
+        for i in movable:
+            lesson = current[i].lesson
+            by_section.setdefault(lesson.section_id, {}).setdefault(lesson.length, []).append(i)
+
+        section_days = Counter()  # (section, day) -> slot bitmask
+        loads = Counter()  # (teacher, day) -> hours
+        repeats = Counter()  # (section, subject, day) -> blocks
+
+        periods, first_period = {}, {}  # section -> periods of its shift, and the first of them
+        for sec_id in {p.lesson.section_id for p in current}:
+            periods[sec_id] = problem.shift_periods(sec_id)
+            first_period[sec_id] = (periods[sec_id] & -periods[sec_id]).bit_length() - 1
+        starts = {(sec_id, length): list(iter_bits(problem.start_mask(sec_id, length)))
+                  for sec_id, lengths in by_section.items() for length in lengths}
+
+        def change(p, sign):
+            # Adds (sign=1) or removes (sign=-1) p; returns the change in penalty
+            lesson = p.lesson
+            length = lesson.length
+            key = (lesson.section_id, p.day)
+            old = section_days[key]
+            bits = ((1 << length) - 1) << p.start
+            new = old | bits if sign > 0 else old & ~bits
+            section_days[key] = new
+            shift_periods = periods[lesson.section_id]
+            delta = w_gap * (idle_periods(new, shift_periods) - idle_periods(old, shift_periods))
+            key = (p.teacher_id, p.day)
+            load = loads[key]
+            loads[key] = load + sign * length
+            delta += w_load * ((load + sign * length) ** 2 - load ** 2)
+            key = (lesson.section_id, lesson.subject_id, p.day)
+            count = repeats[key]
+            repeats[key] = count + sign
+            delta += w_rep * (max(0, count + sign - 1) - max(0, count - 1))
+            if length == 2 and (p.start - first_period[lesson.section_id]) % 2:
+                delta += sign * w_lab
+            return delta
+
+        penalty = sum(change(p, 1) for p in current)
+        start_penalty = best_penalty = penalty
+        best = list(current)
+
+        def relocate(p, day, start):
+            # p at (day, start) keeping its teacher / room when they are free there
+            length = p.lesson.length
+            teachers = grid.free_teachers(day, start, length, p.lesson.teacher_pool)
+            rooms = grid.free_rooms(day, start, length, p.lesson.room_pool)
+            if not teachers or not rooms:
+                return None
+            teacher_id = p.teacher_id if teachers & grid.teacher_bit[p.teacher_id] else rng.choice(grid.teachers_in(teachers))
+            room_id = p.room_id if rooms & grid.room_bit[p.room_id] else rng.choice(grid.rooms_in(rooms))
+            return Placement(p.lesson, day, start, teacher_id, room_id)
+
+        def occupy(p):
+            grid.occupy(p.day, p.start, p.lesson.length, p.lesson.section_id, p.teacher_id, p.room_id)
+
+        def release(p):
+            grid.release(p.day, p.start, p.lesson.length, p.lesson.section_id, p.teacher_id, p.room_id)
+
+        deadline = None if self.time_budget is None else time.monotonic() + self.time_budget
+        temp_start, temp_end = 2.0 * max(w_gap, w_rep, w_load), 0.05
+        temperature = temp_start
+        moves = accepted = 0
+        while movable and not monitor.cancelled and moves != self.max_moves:
+            if moves % 256 == 0:
+                now = time.monotonic()
+                if deadline is not None and now >= deadline:
+                    break
+                # Geometric cooling over the move or time budget
+                if self.max_moves:
+                    elapsed = moves / self.max_moves
+                else:
+                    elapsed = 1 - (deadline - now) / self.time_budget if self.time_budget else 1
+                temperature = temp_start * (temp_end / temp_start) ** elapsed
+            moves += 1
+
+            i = rng.choice(movable)
+            p = current[i]
+            length = p.lesson.length
+            old, new = [(i, p)], []
+            release(p)
+            if rng.random() < self.swap_rate:
+                j = rng.choice(by_section[p.lesson.section_id][length])
+                q = current[j]
+                if j == i or (q.day, q.start) == (p.day, p.start):
+                    occupy(p)
+                    continue
+                release(q)
+                old.append((j, q))
+                p2 = relocate(p, q.day, q.start)
+                if p2 is not None:
+                    occupy(p2)
+                    q2 = relocate(q, p.day, p.start)
+                    if q2 is not None:
+                        occupy(q2)
+                        new = [(i, p2), (j, q2)]
+                    else:
+                        release(p2)
+            else:
+                day, start = rng.randrange(n_days), rng.choice(starts[p.lesson.section_id, length])
+                if (day, start) != (p.day, p.start) and grid.section_free(day, start, length, p.lesson.section_id):
+                    p2 = relocate(p, day, start)
+                    if p2 is not None:
+                        occupy(p2)
+                        new = [(i, p2)]
+            if not new:
+                for _, q in old:
+                    occupy(q)
+                continue
+
+            delta = sum(change(q, -1) for _, q in old) + sum(change(q, 1) for _, q in new)
+            if delta <= 0 or rng.random() < math.exp(-delta / temperature):
+                for k, q in new:
+                    current[k] = q
+                penalty += delta
+                accepted += 1
+                if penalty < best_penalty:
+                    best_penalty, best = penalty, list(current)
+            else:
+                for _, q in new:
+                    change(q, -1)
+                    release(q)
+                for _, q in old:
+                    change(q, 1)
+                    occupy(q)
+
+        # Leave the grid matching what is returned
+        if best_penalty < penalty:
+            for p in current:
+                release(p)
+            for p in best:
+                occupy(p)
+        else:
+            best, best_penalty = current, penalty
+        if stats is not None:
+            stats.counters.update(opt_moves=moves, opt_accepted=accepted, penalty_before=start_penalty,
+                                  penalty_after=best_penalty)
+        return best
+
+
+# --- PARALLEL RESTARTS ---
+# Worker side of Scheduler.generate_parallel. The problem is shipped once per
+# worker process through the pool initializer instead of once per task, along
+# with the pool's stop event: once it is set, running solves return the best
+# partial result they have.
+_worker_problem = None
+_worker_stop = None
+
+
+def _init_worker(problem, stop=None):
+    global _worker_problem, _worker_stop
+    _worker_problem, _worker_stop = problem, stop
+
+
+def _solve_seeded(mode, time_budget, seed, with_stats=False, profile=False):
+    problem = _worker_problem
+    grid = problem.new_grid()
+    stats = SolverStats(profile=profile) if with_stats else None
+    monitor = SolverMonitor(_worker_stop)
+    with (stats or SolverStats()).phase("solve"):
+        placements, unplaced = make_solver(mode, time_budget).solve(problem, grid, problem.lessons,
+                                                                    random.Random(seed), monitor=monitor, stats=stats)
+    if stats is not None:
+        stats.record_unplaced(problem, grid, unplaced)
+        stats = stats.as_dict()
+    # stopped: the pool's stop event cut the solve short
+    return seed, placements, score_placements(problem, placements, unplaced), stats, monitor.cancelled
+
+
+def _solve_partition(mode, time_budget, seed, lessons, with_stats=False):
+    # One group of Scheduler.generate_partitioned, on a grid of its own
+    problem = _worker_problem
+    stats = SolverStats() if with_stats else None
+    placements, unplaced = make_solver(mode, time_budget).solve(problem, problem.new_grid(), lessons,
+                                                                random.Random(seed), monitor=SolverMonitor(_worker_stop),
+                                                                stats=stats)
+    return placements, unplaced, stats and dict(stats.counters)
+
+
+def run_status(monitor, score):
+    # "Cancelled" / "Success", or how many hours a finished run had to drop
+    if monitor is not None and monitor.cancelled:
+        return "Cancelled"
+    if score.unplaced_hours:
+        return f"Incomplete ({score.unplaced_hours} hours could not be placed)"
+    return "Success"
+
+
+# --- ALGORITHM ENGINE ---
+class Scheduler:
+    CACHE_VERSION = 2  # Bump when a solver change makes cached results stale
+    cache_size = 32  # Results kept in the database's result_cache
+
+    def __init__(self, db, mode="backtrack", time_budget=10.0, optimize_time=0.0, optimize_moves=None):
+        self.db = db
+        self.mode = mode
+        self.time_budget = time_budget
+        self.optimize_time = optimize_time  # seconds of ScheduleOptimizer after generating; 0 = off
+        self.optimize_moves = optimize_moves  # or a fixed number of moves, for reproducible runs
+        self.last_seed = None
+        self.last_score = None
+        self.last_problem = None
+        self.last_cached = False
+        self._calendar = None
+        self._calendar_rows = None
+
+    @property
+    def calendar(self):
+        # Compiled from the calendar tables, again only when they have changed
+        rows = self.db.fetch_calendar()
+        if rows != self._calendar_rows:
+            self._calendar, self._calendar_rows = Calendar(*rows), rows
+        return self._calendar
+
+    # Display labels of the calendar's days and periods (schedules are indexed by position)
+    @property
+    def days(self):
+        return self.calendar.days
+
+    @property
+    def slots(self):
+        return self.calendar.slot_labels
+
+    def build_problem(self, stats=None):
+        stats = stats or SolverStats()
+        with stats.phase("fetch"):
+            teachers = self.db.fetch_all("teachers")
+            subjects = self.db.fetch_all("subjects")
+            rooms = self.db.fetch_all("rooms")
+            sections = self.db.fetch_all("sections")
+            teacher_subjects = self.db.fetch_teacher_subjects()
+            section_subjects = self.db.fetch_section_subjects()
+            calendar = self.calendar
+
+        if not (teachers and subjects and rooms and sections):
+            return None
+        return TimetableProblem(calendar, teachers, subjects, rooms, sections, teacher_subjects, section_subjects)
+
+    # generate / generate_parallel / reschedule only touch the database in
+    # build_problem, through the calling thread's own connection, so they can
+    # run on a background thread. Pass a prebuilt `problem` to skip the reads,
+    # a SolverMonitor to follow progress or cancel, and a SolverStats to collect
+    # counters, phase timings and why hours were dropped.
+
+    def generate(self, mode=None, seed=None, problem=None, monitor=None, stats=None, use_cache=True):
+        problem = problem or self.build_problem(stats)
+        if problem is None:
+            return None, "Missing Data: Please add Teachers, Subjects, Rooms, and Sections."
+        self.last_problem = problem
+        self.last_cached = False
+        mode = mode or self.mode
+        keys = [self.cache_key(problem, mode=mode, runs=1, seed=seed)] if use_cache else []
+        cached = keys and self.from_cache(keys[0], problem, stats)
+        if cached:
+            return cached
+
+        if seed is None:
+            seed = random.randrange(2 ** 32)
+            if keys:
+                keys.append(self.cache_key(problem, mode=mode, runs=1, seed=seed))
+        monitor = monitor or SolverMonitor()
+        grid = problem.new_grid()
+        solver = make_solver(mode, self.time_budget)
+        run_stats = stats or SolverStats()
+        rng = random.Random(seed)
+        with run_stats.phase("solve"):
+            placements, unplaced = solver.solve(problem, grid, problem.lessons, rng, monitor=monitor, stats=stats)
+        if stats is not None:
+            stats.record_unplaced(problem, grid, unplaced)
+        placements = self.optimize(problem, placements, rng, grid, monitor, stats)
+        self.last_seed = seed
+        self.last_score = score_placements(problem, placements, unplaced)
+        if keys and not monitor.cancelled:
+            self.store_result(keys, seed, placements, self.last_score)
+        with run_stats.phase("build"):
+            schedule = self.build_schedule(problem, placements)
+        return schedule, run_status(monitor, self.last_score)
+
+    def generate_parallel(self, runs=None, workers=None, time_limit=None, mode=None, seed=None,
+                          problem=None, monitor=None, stats=None, use_cache=True):
+        # Runs independently seeded generations on a process pool and keeps the
+        # best scoring one, lowest seed first on equal scores. time_limit covers
+        # the whole call: runs get an equal share of it per wave (ceil(runs /
+        # workers) waves). Stops early once a run places every hour without
+        # violations, at the deadline (still waiting for the first result if
+        # none is in yet) or on cancel. With a seed the early stop waits for
+        # whole leading waves and only picks among them, so the same seed keeps
+        # the same run however the workers were timed. Runs still in flight
+        # then stop; their partial results only count after a cancel or when
+        # no run has finished, and never beat a finished run. stats receives
+        # the counters summed over finished runs and the drops of the best one.
+        problem = problem or self.build_problem(stats)
+        if problem is None:
+            return None, "Missing Data: Please add Teachers, Subjects, Rooms, and Sections."
+        self.last_problem = problem
+        self.last_cached = False
+
+        workers = workers or os.cpu_count() or 1
+        runs = runs or workers
+        workers = min(workers, runs)
+        mode = mode or self.mode
+        time_limit = self.time_budget if time_limit is None else time_limit
+        config = dict(mode=mode, runs=runs, workers=workers, time_limit=time_limit)
+        keys = [self.cache_key(problem, seed=seed, **config)] if use_cache else []
+        cached = keys and self.from_cache(keys[0], problem, stats)
+        if cached:
+            return cached
+        deadline = time.monotonic() + time_limit
+        run_budget = time_limit * 0.9 / math.ceil(runs / workers)
+        base_seed = random.randrange(2 ** 32) if seed is None else seed
+
+        monitor = monitor or SolverMonitor()
+        total_hours = problem.total_hours()
+        monitor.update(sections_total=runs, total_hours=total_hours)
+        results = {}  # run index -> (seed, placements, score, stats, stopped)
+        best = None
+        chosen = None
+
+        def rank(result):
+            return result[4], result[2], result[0]
+
+        def collect(done):
+            nonlocal best
+            for future in done:
+                result = results[futures[future]] = future.result()
+                if stats is not None:
+                    stats.merge_counters(result[3]["counters"])
+                if best is None or rank(result) < rank(best):
+                    best = result
+
+        def settled():
+            # The runs to choose from once one is complete, or None to keep
+            # waiting: any finished run without a seed, else the leading waves
+            # up to the first one that holds a complete run
+            complete = False
+            for index in range(runs):
+                result = results.get(index)
+                if result is None:
+                    if seed is not None:
+                        return None
+                    continue
+                complete = complete or not (result[2].unplaced_hours or result[2].violations)
+                if complete and seed is not None and ((index + 1) % workers == 0 or index + 1 == runs):
+                    return [results[i] for i in range(index + 1)]
+            return list(results.values()) if complete else None
+
+        started = time.perf_counter()
+        stop = multiprocessing.Event()
+        pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(problem, stop))
+        pending = set()
+        try:
+            futures = {pool.submit(_solve_seeded, mode, run_budget, base_seed + i, stats is not None,
+                                   stats is not None and stats.profile): i
+                       for i in range(runs)}
+            pending = set(futures)
+            while pending and not monitor.cancelled:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 and best is not None:
+                    break
+                # Short waits so a cancel is noticed promptly
+                done, pending = wait(pending, timeout=min(remaining, 0.25) if remaining > 0 else 0.25,
+                                     return_when=FIRST_COMPLETED)
+                collect(done)
+                if done:
+                    # For parallel runs "sections" counts finished runs
+                    monitor.update(sections_done=len(results), best=best[2],
+                                   placed_hours=total_hours - best[2].unplaced_hours)
+                    chosen = settled()
+                    if chosen:
+                        break
+        finally:
+            # Runs in flight stop at their next check and hand back what they
+            # have; runs not started yet are dropped
+            stop.set()
+            pool.shutdown(wait=True, cancel_futures=True)
+        finished = len(results)
+        # Whether the seed alone decides the kept run: every run finished, or
+        # a seeded call settled on its leading waves
+        reproducible = finished == runs or (seed is not None and bool(chosen))
+        if monitor.cancelled or not results:
+            collect(f for f in pending if f.done() and not f.cancelled())
+        if stats is not None:
+            stats.add_time("solve", time.perf_counter() - started)
+        if chosen:
+            best = min(chosen, key=rank)
+
+        if best is None:
+            if monitor.cancelled:
+                return None, "Cancelled before any run finished."
+            return None, "No run finished before the time limit."
+        self.last_seed, placements, self.last_score, best_stats, _ = best
+        if stats is not None:
+            stats.counters["runs_finished"] += finished
+            for name in ("dropped_by_subject", "dropped_by_section", "drop_reasons"):
+                getattr(stats, name).update(best_stats[name])
+            if best_stats["profile_report"]:
+                # Profiled in the worker process that ran the kept seed
+                stats.profile_report = f"Run with seed {self.last_seed}:\n{best_stats['profile_report']}"
+        if (self.optimize_time or self.optimize_moves) and not monitor.cancelled:
+            placements = self.optimize(problem, placements, random.Random(self.last_seed), None, monitor, stats)
+            self.last_score = self.last_score._replace(gaps=score_placements(problem, placements, ()).gaps)
+        if keys and not monitor.cancelled:
+            if seed is None:
+                keys.append(self.cache_key(problem, seed=base_seed, **config))
+            if not reproducible:
+                # The deadline picked the kept run, so the seed key would not
+                # give it back; only an unseeded call's "any seed" key may
+                keys = keys[:-1] if seed is None and not self.last_score.unplaced_hours else []
+            if keys:
+                self.store_result(keys, self.last_seed, placements, self.last_score)
+        with (stats or SolverStats()).phase("build"):
+            schedule = self.build_schedule(problem, placements)
+        return schedule, run_status(monitor, self.last_score)
+
+    def generate_partitioned(self, workers=None, mode=None, seed=None, problem=None, monitor=None, stats=None,
+                             use_cache=True):
+        # Solves the groups of TimetableProblem.partitions (sections sharing no
+        # teacher) concurrently on a process pool, each with a share of the
+        # rooms (allot_rooms), then merges them into one grid. Only rooms are
+        # shared between groups, so the merge only has to settle room clashes:
+        # a clashing block moves to another free room at the same time, or is
+        # re-placed with whatever the groups could not place. time_budget covers
+        # the whole run: the groups share it (wave by wave when there are more
+        # groups than workers) and the merge gets what is left, at least a
+        # tenth of it. "sections" in the monitor counts finished groups.
+        problem = problem or self.build_problem(stats)
+        if problem is None:
+            return None, "Missing Data: Please add Teachers, Subjects, Rooms, and Sections."
+        self.last_problem = problem
+        self.last_cached = False
+        mode = mode or self.mode
+        keys = [self.cache_key(problem, mode=mode, partitioned=True, seed=seed)] if use_cache else []
+        cached = keys and self.from_cache(keys[0], problem, stats)
+        if cached:
+            return cached
+        if seed is None:
+            seed = random.randrange(2 ** 32)
+            if keys:
+                keys.append(self.cache_key(problem, mode=mode, partitioned=True, seed=seed))
+
+        monitor = monitor or SolverMonitor()
+        run_stats = stats or SolverStats()
+        parts = problem.allot_rooms(problem.partitions())
+        workers = max(1, min(workers or os.cpu_count() or 1, len(parts)))  # No parts when no hours are owed
+        deadline = time.monotonic() + self.time_budget
+        group_budget = self.time_budget * 0.9 / max(1, math.ceil(len(parts) / workers))
+        monitor.update(sections_total=len(parts), total_hours=problem.total_hours())
+        results = [None] * len(parts)
+        with run_stats.phase("solve"):
+            if workers > 1:
+                stop = multiprocessing.Event()
+                pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(problem, stop))
+                pending = {}
+                try:
+                    pending = {pool.submit(_solve_partition, mode, group_budget, seed + i, lessons,
+                                           stats is not None): i for i, lessons in enumerate(parts)}
+                    while pending and not monitor.cancelled:
+                        done, _ = wait(pending, timeout=0.25, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            results[pending.pop(future)] = future.result()
+                        monitor.update(sections_done=sum(r is not None for r in results),
+                                       placed_hours=sum(p.lesson.length for r in results if r for p in r[0]))
+                finally:
+                    # On cancel, groups in flight return what they have placed
+                    stop.set()
+                    pool.shutdown(wait=True, cancel_futures=True)
+                for future, i in pending.items():
+                    if future.done() and not future.cancelled():
+                        results[i] = future.result()
+            else:
+                for i, lessons in enumerate(parts):
+                    if monitor.cancelled:
+                        break
+                    placed, unplaced = make_solver(mode, group_budget).solve(
+                        problem, problem.new_grid(), lessons, random.Random(seed + i), monitor=monitor.child(),
+                        stats=stats)
+                    results[i] = (placed, unplaced, None)
+                    monitor.update(sections_done=i + 1,
+                                   placed_hours=sum(p.lesson.length for r in results if r for p in r[0]))
+
+        # Merge: back to the full room pools, settling room clashes between groups
+        with run_stats.phase("reconcile"):
+            grid = problem.new_grid()
+            placements, leftover = [], []
+            for lessons, result in zip(parts, results):
+                if result is None:
+                    leftover.extend(lessons)  # Cancelled before this group finished
+                    continue
+                placed, unplaced, counters = result
+                if counters:
+                    stats.merge_counters(counters)
+                leftover.extend(problem.lesson_index[l.section_id, l.subject_id] for l in unplaced)
+                for p in placed:
+                    lesson = problem.lesson_index[p.lesson.section_id, p.lesson.subject_id]
+                    p = p._replace(lesson=lesson)
+                    if not grid.is_free(p.day, p.start, lesson.length, lesson.section_id, p.teacher_id, p.room_id):
+                        rooms = grid.free_rooms(p.day, p.start, lesson.length, lesson.room_pool)
+                        if not rooms:
+                            leftover.append(lesson)
+                            run_stats.counters["reconcile_ripped"] += 1
+                            continue
+                        p = p._replace(room_id=grid.rooms_in(rooms)[0])
+                        run_stats.counters["reconcile_rooms"] += 1
+                    grid.occupy(p.day, p.start, lesson.length, lesson.section_id, p.teacher_id, p.room_id)
+                    placements.append(p)
+            rng = random.Random(seed)
+            budget = max(deadline - time.monotonic(), self.time_budget / 10)
+            placed, unplaced = make_solver(mode, budget).solve(problem, grid, leftover, rng, monitor=monitor,
+                                                               stats=stats)
+            placements += placed
+        placed_hours = problem.total_hours() - problem.total_hours(unplaced)
+        monitor.update(sections_total=len(parts), sections_done=sum(r is not None for r in results),
+                       total_hours=problem.total_hours(), placed_hours=placed_hours, best=placed_hours)
+        if stats is not None:
+            stats.counters["partitions"] += len(parts)
+            stats.record_unplaced(problem, grid, unplaced)
+        placements = self.optimize(problem, placements, rng, grid, monitor, stats)
+        self.last_seed = seed
+        self.last_score = score_placements(problem, placements, unplaced)
+        if keys and not monitor.cancelled:
+            self.store_result(keys, seed, placements, self.last_score)
+        with run_stats.phase("build"):
+            schedule = self.build_schedule(problem, placements)
+        return schedule, run_status(monitor, self.last_score)
+
+    def reschedule(self, schedule, teacher_unavailable=None, rooms_removed=(), subject_hours=None, mode=None, seed=None,
+                   problem=None, monitor=None, stats=None):
+        # Incremental repair of an existing schedule. Only blocks touched by the
+        # change are ripped up and re-placed; everything else stays where it is.
+        #   teacher_unavailable: {teacher_id: [days]} the teacher is away (index or name)
+        #   rooms_removed:       room ids that can no longer be used
+        #   subject_hours:       {subject_id: hours} overrides of hours_per_week
+        # Teachers, rooms, sections and hours changed in the database since the
+        # schedule was made are picked up the same way.
+        problem = problem or self.build_problem(stats)
+        if problem is None:
+            return None, "Missing Data: Please add Teachers, Subjects, Rooms, and Sections."
+        self.last_problem = problem
+        self.last_cached = False
+        teacher_unavailable = teacher_unavailable or {}
+        if subject_hours:
+            problem.set_hours(subject_hours)
+
+        grid = problem.new_grid()
+        for teacher_id, days in teacher_unavailable.items():
+            for day in days:
+                grid.block_teacher(teacher_id, day if isinstance(day, int) else problem.calendar.days.index(day))
+        for room_id in rooms_removed:
+            grid.block_room(room_id)
+
+        # Blocks still owed per (section, subject) under the current data
+        owed = {}
+        for lesson in problem.lessons:
+            owed.setdefault((lesson.section_id, lesson.subject_id), []).append(lesson)
+
+        kept, ripped = [], 0
+        for p in self.placements_from_schedule(problem, schedule):
+            lesson = p.lesson
+            left = owed.get((lesson.section_id, lesson.subject_id))
+            if (not left
+                    or p.teacher_id not in problem.teachers or p.room_id not in problem.rooms
+                    or not grid.teacher_bit[p.teacher_id] & lesson.teacher_pool
+                    or not grid.room_bit[p.room_id] & lesson.room_pool
+                    or not problem.start_mask(lesson.section_id, lesson.length) >> p.start & 1
+                    or not grid.is_free(p.day, p.start, lesson.length, lesson.section_id, p.teacher_id, p.room_id)):
+                ripped += 1  # Subject cut, resource gone or no longer eligible, shift changed or now blocked
+                continue
+            left.pop()
+            grid.occupy(p.day, p.start, lesson.length, lesson.section_id, p.teacher_id, p.room_id)
+            kept.append(p)
+
+        todo = [lesson for lessons in owed.values() for lesson in lessons]
+        if seed is None:
+            seed = random.randrange(2 ** 32)
+        solver = make_solver(mode or self.mode, self.time_budget)
+        run_stats = stats or SolverStats()
+        with run_stats.phase("solve"):
+            placed, unplaced = solver.solve(problem, grid, todo, random.Random(seed), monitor=monitor, stats=stats)
+        if stats is not None:
+            stats.record_unplaced(problem, grid, unplaced)
+
+        placements = kept + placed
+        self.last_seed = seed
+        self.last_score = score_placements(problem, placements, unplaced)
+        outcome = run_status(monitor, self.last_score)
+        with run_stats.phase("build"):
+            schedule = self.build_schedule(problem, placements)
+        return schedule, f"{outcome}: kept {len(kept)} blocks, ripped up {ripped}, re-placed {len(placed)} of {len(todo)}"
+
+    def optimize(self, problem, placements, rng, grid=None, monitor=None, stats=None):
+        # Soft-constraint pass (ScheduleOptimizer) for optimize_time seconds or
+        # optimize_moves moves; grid is the solver's grid, rebuilt when not given
+        if not (self.optimize_time or self.optimize_moves) or (monitor is not None and monitor.cancelled):
+            return placements
+        if grid is None:
+            grid = problem.new_grid()
+            for p in placements:
+                grid.occupy(p.day, p.start, p.lesson.length, p.lesson.section_id, p.teacher_id, p.room_id)
+        with (stats or SolverStats()).phase("optimize"):
+            optimizer = ScheduleOptimizer(self.optimize_time or None, max_moves=self.optimize_moves)
+            return optimizer.optimize(problem, grid, placements, rng, monitor, stats)
+
+    # --- RESULT CACHE ---
+    # A finished generate / generate_parallel is stored under a hash of the
+    # input data, the solver settings and the seed ("any seed" too when none
+    # was given), so running again on unchanged data returns it at once.
+    def cache_key(self, problem, **config):
+        return problem.fingerprint(version=self.CACHE_VERSION, time_budget=self.time_budget,
+                                   optimize_time=self.optimize_time, optimize_moves=self.optimize_moves,
+                                   weights=ScheduleOptimizer.weights, **config)
+
+    def store_result(self, keys, seed, placements, score):
+        # keys[-1] is the key of the exact seed. An unseeded call's "any seed"
+        # key only gets complete results, so asking again after a run that
+        # dropped hours tries a new seed instead of returning the same one.
+        if score.unplaced_hours:
+            keys = keys[-1:]
+        rows = [(p.day, p.start, p.lesson.section_id, p.lesson.subject_id, p.teacher_id, p.room_id) for p in placements]
+        payload = zlib.compress(json.dumps({"placements": rows, "score": list(score)}).encode())
+        self.db.cache_put(keys, seed, payload, self.cache_size)
+
+    def from_cache(self, key, problem, stats=None):
+        # (schedule, status) of a cached result, or None on a miss
+        hit = self.db.cache_get(key)
+        if hit is None:
+            return None
+        seed, payload = hit
+        data = json.loads(zlib.decompress(payload))
+        placements = []
+        for day, start, sec_id, sub_id, teacher_id, room_id in data["placements"]:
+            placements.append(Placement(problem.lesson_index[sec_id, sub_id], day, start, teacher_id, room_id))
+        self.last_seed, self.last_score, self.last_cached = seed, ScheduleScore(*data["score"]), True
+        if stats is not None:
+            stats.counters["cache_hits"] += 1
+        with (stats or SolverStats()).phase("build"):
+            schedule = self.build_schedule(problem, placements)
+        return schedule, run_status(None, self.last_score) + " (cached)"
+
+    def build_schedule(self, problem, placements):
+        # Schedule Structure: schedule[day][slot][section_id] = {subject, teacher, room},
+        # day and slot being calendar indices (nested lists, one dict per period)
+        schedule = [[{} for _ in range(problem.n_slots)] for _ in range(problem.n_days)]
+        for p in placements:
+            _, sub_name, _, sub_type, _ = problem.subjects[p.lesson.subject_id]
+            for slot in range(p.start, p.start + p.lesson.length):
+                schedule[p.day][slot][p.lesson.section_id] = {
+                    "subject": f"{sub_name} ({sub_type})",
+                    "teacher": problem.teachers[p.teacher_id][1],
+                    "room": problem.rooms[p.room_id][1],
+                    "subject_id": p.lesson.subject_id,
+                    "teacher_id": p.teacher_id,
+                    "room_id": p.room_id
+                }
+        return schedule
+
+    def save_schedule(self, schedule, mode=None, seed=None):
+        # Persists a schedule dict as a new run of schedule_entries
+        entries = []
+        for day, periods in enumerate(schedule):
+            for slot, cell in enumerate(periods):
+                for sec_id, data in cell.items():
+                    entries.append((day, slot, sec_id, data["subject_id"], data["teacher_id"], data["room_id"]))
+        return self.db.save_schedule(entries, mode, seed)
+
+    def load_schedule(self, run_id=None):
+        # Rebuilds the schedule dict of a stored run (latest by default), or None
+        run_id = run_id or self.db.latest_run_id()
+        if run_id is None:
+            return None
+        subjects = {s[0]: s for s in self.db.fetch_all("subjects")}
+        teachers = {t[0]: t for t in self.db.fetch_all("teachers")}
+        rooms = {r[0]: r for r in self.db.fetch_all("rooms")}
+        calendar = self.calendar
+        schedule = [[{} for _ in range(calendar.n_slots)] for _ in range(calendar.n_days)]
+        for day, slot, sec_id, sub_id, teacher_id, room_id in self.db.fetch_schedule(run_id):
+            if sub_id not in subjects or teacher_id not in teachers or room_id not in rooms:
+                continue  # Record deleted since the run was saved
+            if day >= calendar.n_days or slot >= calendar.n_slots:
+                continue  # Calendar shortened since
+            _, sub_name, _, sub_type, _ = subjects[sub_id]
+            schedule[day][slot][sec_id] = {
+                "subject": f"{sub_name} ({sub_type})",
+                "teacher": teachers[teacher_id][1],
+                "room": rooms[room_id][1],
+                "subject_id": sub_id,
+                "teacher_id": teacher_id,
+                "room_id": room_id
+            }
+        return schedule
+
+    def placements_from_schedule(self, problem, schedule):
+        # Rebuilds Placement blocks from a schedule dict; Lab hours are paired
+        # back into their 2-slot blocks. Entries whose section or subject is no
+        # longer taught are dropped.
+        placements = []
+        for day_idx, periods in enumerate(schedule):
+            open_blocks = {}  # section -> (entry, start) of a Lab block waiting for its 2nd hour
+            for slot_idx, cell in enumerate(periods):
+                for sec_id, entry in cell.items():
+                    lesson = problem.lesson_index.get((sec_id, entry["subject_id"]))
+                    if lesson is None:
+                        continue
+                    pending = open_blocks.pop(sec_id, None)
+                    if lesson.length == 2 and pending is None:
+                        open_blocks[sec_id] = (entry, slot_idx)
+                        continue
+                    start = slot_idx if lesson.length == 1 else pending[1]
+                    placements.append(Placement(lesson, day_idx, start, entry["teacher_id"], entry["room_id"]))
+        return placements
+
+    def build_views(self, schedule, sections=None):
+        # Section, teacher and room timetables from one pass over the schedule.
+        # views[kind][entity_id] = (name, {(day, slot): cell text}), by calendar index
+        if sections is None:
+            sections = self.db.fetch_all("sections")
+        section_names = {s[0]: s[1] for s in sections}
+        views = {"section": {sec_id: (name, {}) for sec_id, name in section_names.items()}, "teacher": {}, "room": {}}
+        for day, periods in enumerate(schedule):
+            for slot, cell in enumerate(periods):
+                for sec_id, data in cell.items():
+                    sec_name = section_names.get(sec_id, str(sec_id))
+                    if sec_id in views["section"]:
+                        views["section"][sec_id][1][(day, slot)] = f"{data['subject']}\n{data['teacher']}\n{data['room']}"
+                    teacher = views["teacher"].setdefault(data["teacher_id"], (data["teacher"], {}))
+                    teacher[1][(day, slot)] = f"{data['subject']}\n{sec_name}\n{data['room']}"
+                    room = views["room"].setdefault(data["room_id"], (data["room"], {}))
+                    room[1][(day, slot)] = f"{data['subject']}\n{sec_name}\n{data['teacher']}"
+        for kind in ("teacher", "room"):
+            views[kind] = dict(sorted(views[kind].items(), key=lambda item: item[1][0]))
+        return views
+
+    def section_slots(self, sections=None):
+        # {section id: period indices of its shift}: the columns of its own
+        # timetable (teacher and room timetables show every period)
+        if sections is None:
+            sections = self.db.fetch_all("sections")
+        calendar = self.calendar
+        return {s[0]: list(iter_bits(calendar.shift_slots[calendar.shift_of(s[3] if len(s) > 3 else None)]))
+                for s in sections}
+
+    def validate(self, schedule, problem=None, max_daily_hours=5):
+        # Lazy violation report (see validate_schedule) of a schedule against
+        # the current data; nothing is yielded when there is no data to check
+        problem = problem or self.build_problem()
+        if problem is None:
+            return iter(())
+        return validate_schedule(problem, schedule, max_daily_hours)
+
+    def export_to_excel(self, schedule, filename, sections=None, views=("section",), stats=None):
+        # Streaming export: a write-only workbook keeps memory flat no matter how
+        # many sheets there are. One sheet group per requested view, in order.
+        with (stats or SolverStats()).phase("export"):
+            if sections is None:
+                sections = self.db.fetch_all("sections")
+            all_views = self.build_views(schedule, sections)
+            write_view_workbook(filename, [(kind, all_views[kind]) for kind in views], self.days, self.slots,
+                                self.section_slots(sections))
+
+    def export_split(self, schedule, filename, sections=None, workers=1, views=("section", "teacher", "room")):
+        # One workbook per requested view (<name>_sections.xlsx, _teachers.xlsx,
+        # _rooms.xlsx), written in parallel worker processes when workers > 1
+        if sections is None:
+            sections = self.db.fetch_all("sections")
+        all_views = self.build_views(schedule, sections)
+        section_slots = self.section_slots(sections)
+        stem = os.path.splitext(filename)[0]
+        jobs = [(f"{stem}_{kind}s.xlsx", [(kind, all_views[kind])], self.days, self.slots, section_slots)
+                for kind in views]
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+                list(pool.map(write_view_workbook, *zip(*jobs)))
+        else:
+            for job in jobs:
+                write_view_workbook(*job)
+        return [job[0] for job in jobs]
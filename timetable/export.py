@@ -0,0 +1,81 @@
+import openpyxl
+from openpyxl.styles import Font, Alignment, PatternFill, Border, Side, NamedStyle
+from openpyxl.cell import WriteOnlyCell
+
+# --- EXCEL EXPORT ---
+VIEW_LABELS = {"section": "Section", "teacher": "Teacher", "room": "Room"}
+
+
+def write_view_workbook(filename, views, days, slots, section_slots=None):
+    # views: [(kind, {entity_id: (name, {(day, slot): text})})] with day / slot
+    # indices into the `days` / `slots` labels. Section sheets only get the
+    # columns of their shift (section_slots: {section id: slot indices}).
+    # Styles are registered once as named styles and shared by every cell;
+    # rows are emitted top to bottom.
+    section_slots = section_slots or {}
+    all_slots = list(range(len(slots)))
+    wb = openpyxl.Workbook(write_only=True)
+    add_export_styles(wb)
+    used_titles = set()
+    multi = len(views) > 1
+
+    for kind, view in views:
+        label = VIEW_LABELS[kind]
+        for entity_id, (name, cells) in view.items():
+            columns = section_slots.get(entity_id, all_slots) if kind == "section" else all_slots
+            title = sheet_title(f"{label[0]} - {name}" if multi and kind != "section" else name, used_titles)
+            ws = wb.create_sheet(title=title)
+            for col in range(2, len(columns) + 2):
+                ws.column_dimensions[openpyxl.utils.get_column_letter(col)].width = 25
+
+            # Header Info (rows 1-5)
+            ws.append([])
+            ws.append([None, styled_cell(ws, "School of Computer Application, JECRC University", "tt_title")])
+            ws.append([None, "Time Table - Generated"])
+            ws.append([None, f"{label}: {name}"])
+            ws.append([])
+
+            # Table Headers
+            ws.append(["Day / Time"] + [styled_cell(ws, slots[slot], "tt_header") for slot in columns])
+
+            # Fill Data
+            for day, day_label in enumerate(days):
+                row = [styled_cell(ws, day_label, "tt_day")]
+                for slot in columns:
+                    row.append(styled_cell(ws, cells.get((day, slot), "---"), "tt_cell"))
+                ws.append(row)
+
+    wb.save(filename)
+
+
+def sheet_title(name, used):
+    # Excel sheet names: max 31 chars, no []:*?/\ and unique per workbook
+    title = "".join("_" if ch in '[]:*?/\\' else ch for ch in str(name))[:31] or "Sheet"
+    base, n = title, 2
+    while title.lower() in used:
+        suffix = f" ({n})"
+        title = base[:31 - len(suffix)] + suffix
+        n += 1
+    used.add(title.lower())
+    return title
+
+
+def add_export_styles(wb):
+    # Named styles shared by every sheet of an export workbook
+    thin = Side(style='thin')
+    thin_border = Border(left=thin, right=thin, top=thin, bottom=thin)
+    styles = [
+        NamedStyle(name="tt_title", font=Font(bold=True, size=14)),
+        NamedStyle(name="tt_header", font=Font(bold=True, color="FFFFFF"), border=thin_border,
+                   fill=PatternFill(start_color="4F81BD", end_color="4F81BD", fill_type="solid")),
+        NamedStyle(name="tt_day", font=Font(bold=True), border=thin_border),
+        NamedStyle(name="tt_cell", border=thin_border, alignment=Alignment(wrap_text=True, vertical='top')),
+    ]
+    for style in styles:
+        wb.add_named_style(style)
+
+
+def styled_cell(ws, value, style):
+    cell = WriteOnlyCell(ws, value=value)
+    cell.style = style
+    return cell
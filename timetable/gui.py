@@ -0,0 +1,571 @@
+import threading
+from tkinter import messagebox, filedialog
+
+import customtkinter as ctk
+
+from .db import DatabaseManager, import_file
+from .engine import Scheduler, SolverMonitor, SolverStats, ScheduleScore
+from .validate import summarize
+from .widgets import RecordList, ScheduleGrid
+
+# --- CONFIGURATION & THEME ---
+ctk.set_appearance_mode("System")  # Modes: "System" (standard), "Dark", "Light"
+ctk.set_default_color_theme("blue")  # Themes: "blue", "green", "dark-blue"
+
+# --- GUI APPLICATION ---
+class TimeTableApp(ctk.CTk):
+    SOLVER_MODES = {"Backtracking": "backtrack", "Fast (Greedy)": "fast"}
+    OPTIMIZE_SECONDS = 3.0
+    OPTIMIZE_MOVES = 100000  # Used instead of seconds when a seed is given (about as long)
+    LIST_HEADERS = {
+        "teachers": ["ID", "Name", "Code"],
+        "subjects": ["ID", "Name", "Code", "Type", "Hours"],
+        "rooms": ["ID", "Name", "Capacity", "Type"],
+        "sections": ["ID", "Name", "Strength", "Shift ID"],
+    }
+
+    def __init__(self):
+        super().__init__()
+        
+        self.db = DatabaseManager()
+        self.scheduler = Scheduler(self.db)
+        self.schedule_data = None
+
+        self.title("JECRC Timetable Generator")
+        self.geometry("1100x700")
+
+        # Layout Configuration
+        self.grid_columnconfigure(1, weight=1)
+        self.grid_rowconfigure(0, weight=1)
+
+        self.setup_sidebar()
+        self.setup_pages()
+        self.show_frame("Dashboard")
+        self.load_saved_schedule()
+
+    def load_saved_schedule(self):
+        # Pick up the last generated timetable so it can be exported or repaired right away
+        schedule = self.scheduler.load_schedule()
+        if schedule:
+            self.schedule_data = schedule
+            self.show_grid(schedule)
+            self.preview_area.insert("end", "Loaded the last saved schedule. Run the algorithm to generate a new one.\n")
+            self.preview_area.configure(state="disabled")
+            self.export_btn.configure(state="normal")
+            self.repair_btn.configure(state="normal")
+
+    def setup_sidebar(self):
+        self.sidebar_frame = ctk.CTkFrame(self, width=200, corner_radius=0)
+        self.sidebar_frame.grid(row=0, column=0, sticky="nsew")
+        self.sidebar_frame.grid_rowconfigure(8, weight=1)
+
+        self.logo_label = ctk.CTkLabel(self.sidebar_frame, text="Timetable Gen", font=ctk.CTkFont(size=20, weight="bold"))
+        self.logo_label.grid(row=0, column=0, padx=20, pady=(20, 10))
+
+        buttons = [
+            ("Dashboard", "Dashboard"),
+            ("Faculty", "Teachers"),
+            ("Subjects", "Subjects"),
+            ("Rooms", "Rooms"),
+            ("Sections", "Sections"),
+            ("Generate", "Generate"),
+            ("Settings", "Settings")
+        ]
+
+        self.nav_buttons = {}
+        for i, (text, name) in enumerate(buttons):
+            btn = ctk.CTkButton(self.sidebar_frame, text=text, command=lambda n=name: self.show_frame(n))
+            btn.grid(row=i+1, column=0, padx=20, pady=10)
+            self.nav_buttons[name] = btn
+
+    def setup_pages(self):
+        self.frames = {}
+        
+        # --- Dashboard Frame ---
+        dash = ctk.CTkFrame(self)
+        self.frames["Dashboard"] = dash
+        ctk.CTkLabel(dash, text="Dashboard Overview", font=("Arial", 24)).pack(pady=20)
+        self.stats_label = ctk.CTkLabel(dash, text="Welcome! Use the sidebar to manage data.", font=("Arial", 16))
+        self.stats_label.pack(pady=10)
+        
+        # --- Teachers Frame ---
+        self.frames["Teachers"] = self.create_crud_frame("Faculty Management", 
+                                                         ["Name", "Code", "Subject Codes (optional)"], 
+                                                         self.add_teacher_action, 
+                                                         "teachers")
+
+        # --- Subjects Frame ---
+        self.frames["Subjects"] = self.create_subject_frame()
+
+        # --- Rooms Frame ---
+        self.frames["Rooms"] = self.create_room_frame()
+
+        # --- Sections Frame ---
+        self.frames["Sections"] = self.create_crud_frame("Section Management", 
+                                                         ["Section Name (e.g., BCA I A)", "Strength (optional)",
+                                                          "Subject Codes (optional)", "Shift (optional)"], 
+                                                         self.add_section_action, 
+                                                         "sections")
+
+        # --- Generate Frame ---
+        gen = ctk.CTkScrollableFrame(self)
+        self.frames["Generate"] = gen
+        ctk.CTkLabel(gen, text="Generate Timetable", font=("Arial", 24)).pack(pady=20)
+        
+        self.solver_opt = ctk.CTkOptionMenu(gen, values=list(self.SOLVER_MODES))
+        self.solver_opt.set("Backtracking")
+        self.solver_opt.pack(pady=(0, 5))
+
+        # Parallel restarts: best of N seeded runs across the CPU cores
+        self.runs_opt = ctk.CTkOptionMenu(gen, values=["1 run", "4 runs", "8 runs", "16 runs"])
+        self.runs_opt.set("1 run")
+        self.runs_opt.pack(pady=(0, 5))
+
+        # Soft-constraint pass after generating (fewer gaps, evener teacher days)
+        self.optimize_chk = ctk.CTkCheckBox(gen, text="Optimize gaps and daily load (+3 s)")
+        self.optimize_chk.select()
+        self.optimize_chk.pack(pady=(0, 5))
+
+        # Same seed + same data = same timetable (Optimize then runs a fixed number of
+        # moves instead of seconds); unchanged data reuses the cached result
+        seed_frame = ctk.CTkFrame(gen, fg_color="transparent")
+        seed_frame.pack(pady=(0, 5))
+        self.seed_ent = ctk.CTkEntry(seed_frame, placeholder_text="Seed (optional)", width=150)
+        self.seed_ent.pack(side="left", padx=5)
+        self.cache_chk = ctk.CTkCheckBox(seed_frame, text="Reuse the result if nothing changed")
+        self.cache_chk.select()
+        self.cache_chk.pack(side="left", padx=5)
+
+        # Departments with their own teachers are solved apart, one per CPU core
+        self.partition_chk = ctk.CTkCheckBox(gen, text="Solve departments separately (in parallel)")
+        self.partition_chk.pack(pady=(0, 5))
+
+        run_frame = ctk.CTkFrame(gen, fg_color="transparent")
+        run_frame.pack(pady=(20, 5))
+        self.gen_btn = ctk.CTkButton(run_frame, text="Run Algorithm", command=self.run_generation, height=50, fg_color="green")
+        self.gen_btn.pack(side="left", padx=5)
+        self.cancel_btn = ctk.CTkButton(run_frame, text="Cancel", command=self.cancel_job, height=50,
+                                        fg_color="firebrick", state="disabled")
+        self.cancel_btn.pack(side="left", padx=5)
+
+        self.progress_bar = ctk.CTkProgressBar(gen, width=400)
+        self.progress_bar.set(0)
+        self.progress_bar.pack(pady=(5, 0))
+        self.progress_label = ctk.CTkLabel(gen, text="")
+        self.progress_label.pack(pady=(0, 10))
+
+        self.preview_area = ctk.CTkTextbox(gen, width=800, height=140)
+        self.preview_area.pack(pady=10)
+
+        # Whole result, one section / teacher / room at a time
+        self.grid_view = ScheduleGrid(gen)
+        self.grid_view.pack(pady=10, fill="x")
+        
+        self.export_btn = ctk.CTkButton(gen, text="Export to Excel (.xlsx)", command=self.export_file, state="disabled")
+        self.export_btn.pack(pady=10)
+        self.export_views_chk = ctk.CTkCheckBox(gen, text="Include Teacher and Room timetables")
+        self.export_views_chk.pack(pady=(0, 10))
+
+        # Incremental repair: keep the current timetable, re-place only what a change breaks
+        repair_frame = ctk.CTkFrame(gen)
+        repair_frame.pack(pady=10)
+        self.leave_code_ent = ctk.CTkEntry(repair_frame, placeholder_text="Teacher Code on leave (optional)", width=220)
+        self.leave_code_ent.pack(side="left", padx=5)
+        self.leave_day_opt = ctk.CTkOptionMenu(repair_frame, values=self.scheduler.days)
+        self.leave_day_opt.pack(side="left", padx=5)
+        self.repair_btn = ctk.CTkButton(repair_frame, text="Repair Schedule", command=self.repair_schedule, state="disabled")
+        self.repair_btn.pack(side="left", padx=5)
+
+        # --- Settings Frame ---
+        self.frames["Settings"] = self.create_settings_frame()
+
+    def create_crud_frame(self, title, fields, add_command, table_name):
+        frame = ctk.CTkFrame(self)
+        ctk.CTkLabel(frame, text=title, font=("Arial", 24)).pack(pady=20)
+        
+        input_frame = ctk.CTkFrame(frame)
+        input_frame.pack(pady=10)
+        
+        entries = []
+        for field in fields:
+            ent = ctk.CTkEntry(input_frame, placeholder_text=field, width=200)
+            ent.pack(side="left", padx=5)
+            entries.append(ent)
+            
+        ctk.CTkButton(input_frame, text="Add", command=lambda: add_command(entries, list_box)).pack(side="left", padx=5)
+        ctk.CTkButton(input_frame, text="Import...", width=80,
+                      command=lambda: self.import_action(table_name, list_box)).pack(side="left", padx=5)
+        
+        list_box = RecordList(frame, self.db, table_name, self.LIST_HEADERS[table_name])
+        list_box.pack(pady=20, fill="both", expand=True)
+        
+        return frame
+
+    def create_subject_frame(self):
+        frame = ctk.CTkFrame(self)
+        ctk.CTkLabel(frame, text="Subject Management", font=("Arial", 24)).pack(pady=20)
+        
+        input_frame = ctk.CTkFrame(frame)
+        input_frame.pack(pady=10)
+        
+        name_ent = ctk.CTkEntry(input_frame, placeholder_text="Name")
+        name_ent.pack(side="left", padx=5)
+        code_ent = ctk.CTkEntry(input_frame, placeholder_text="Code")
+        code_ent.pack(side="left", padx=5)
+        type_ent = ctk.CTkComboBox(input_frame, values=["Theory", "Lab"])
+        type_ent.pack(side="left", padx=5)
+        hours_ent = ctk.CTkEntry(input_frame, placeholder_text="Hrs/Week")
+        hours_ent.pack(side="left", padx=5)
+
+        def add_sub():
+            if name_ent.get() and hours_ent.get().isdigit():
+                self.db.add_subject(name_ent.get(), code_ent.get(), type_ent.get(), int(hours_ent.get()))
+                list_box.appended()
+                name_ent.delete(0, 'end')
+                code_ent.delete(0, 'end')
+                hours_ent.delete(0, 'end')
+            else:
+                messagebox.showerror("Error", "Invalid Input")
+
+        ctk.CTkButton(input_frame, text="Add", command=add_sub).pack(side="left", padx=5)
+        ctk.CTkButton(input_frame, text="Import...", width=80,
+                      command=lambda: self.import_action("subjects", list_box)).pack(side="left", padx=5)
+        list_box = RecordList(frame, self.db, "subjects", self.LIST_HEADERS["subjects"])
+        list_box.pack(pady=20, fill="both", expand=True)
+        return frame
+
+    def create_room_frame(self):
+        frame = ctk.CTkFrame(self)
+        ctk.CTkLabel(frame, text="Room Management", font=("Arial", 24)).pack(pady=20)
+        
+        input_frame = ctk.CTkFrame(frame)
+        input_frame.pack(pady=10)
+        
+        name_ent = ctk.CTkEntry(input_frame, placeholder_text="Room No (e.g. VIB 503)")
+        name_ent.pack(side="left", padx=5)
+        cap_ent = ctk.CTkEntry(input_frame, placeholder_text="Capacity")
+        cap_ent.pack(side="left", padx=5)
+        type_ent = ctk.CTkComboBox(input_frame, values=["Lecture Hall", "Lab"])
+        type_ent.pack(side="left", padx=5)
+
+        def add_rm():
+            if name_ent.get() and cap_ent.get().isdigit():
+                if not self.db.add_room(name_ent.get(), int(cap_ent.get()), type_ent.get()):
+                    messagebox.showerror("Error", "Room No must be unique.")
+                    return
+                list_box.appended()
+                name_ent.delete(0, 'end')
+                cap_ent.delete(0, 'end')
+            else:
+                messagebox.showerror("Error", "Invalid Input")
+
+        ctk.CTkButton(input_frame, text="Add", command=add_rm).pack(side="left", padx=5)
+        ctk.CTkButton(input_frame, text="Import...", width=80,
+                      command=lambda: self.import_action("rooms", list_box)).pack(side="left", padx=5)
+        list_box = RecordList(frame, self.db, "rooms", self.LIST_HEADERS["rooms"])
+        list_box.pack(pady=20, fill="both", expand=True)
+        return frame
+
+    def create_settings_frame(self):
+        frame = ctk.CTkFrame(self)
+        ctk.CTkLabel(frame, text="Application Settings", font=("Arial", 24)).pack(pady=20)
+        
+        # Scaling
+        ctk.CTkLabel(frame, text="UI Scaling:").pack(pady=(20,5))
+        scale_opt = ctk.CTkOptionMenu(frame, values=["80%", "90%", "100%", "110%", "120%"], 
+                                      command=self.change_scaling)
+        scale_opt.set("100%")
+        scale_opt.pack(pady=5)
+        
+        # Appearance
+        ctk.CTkLabel(frame, text="Appearance Mode:").pack(pady=(20,5))
+        app_opt = ctk.CTkOptionMenu(frame, values=["System", "Light", "Dark"], 
+                                    command=lambda v: ctk.set_appearance_mode(v))
+        app_opt.set("System")
+        app_opt.pack(pady=5)
+
+        # Calendar: days, and per shift its slots and breaks (default week when empty)
+        ctk.CTkLabel(frame, text="Calendar:").pack(pady=(20, 5))
+        self.calendar_label = ctk.CTkLabel(frame, text="", justify="left")
+        self.calendar_label.pack(pady=5)
+        cal_frame = ctk.CTkFrame(frame, fg_color="transparent")
+        cal_frame.pack(pady=5)
+        ctk.CTkButton(cal_frame, text="Import Calendar...", command=self.import_calendar).pack(side="left", padx=5)
+        ctk.CTkButton(cal_frame, text="Reset to Default", fg_color="firebrick",
+                      command=self.reset_calendar).pack(side="left", padx=5)
+        self.refresh_calendar()
+
+        return frame
+
+    def refresh_calendar(self):
+        calendar = self.scheduler.calendar
+        lines = [f"Days: {', '.join(calendar.days)}"]
+        for shift, periods in calendar.shift_slots.items():
+            labels = [calendar.slot_labels[i] for i in range(calendar.n_slots) if periods >> i & 1]
+            lines.append(f"{calendar.shift_names[shift]}: {', '.join(labels)}")
+        self.calendar_label.configure(text="\n".join(lines))
+        self.leave_day_opt.configure(values=calendar.days)
+        self.leave_day_opt.set(calendar.days[0])
+
+    # --- ACTIONS ---
+    def subject_ids_from_codes(self, text):
+        # "CS101, CS102" -> subject ids; None (after an error box) on an unknown code
+        by_code = {str(s[2]).lower(): s[0] for s in self.db.fetch_all("subjects")}
+        codes = [c.strip() for c in text.split(",") if c.strip()]
+        unknown = [c for c in codes if c.lower() not in by_code]
+        if unknown:
+            messagebox.showerror("Error", f"Unknown subject code(s): {', '.join(unknown)}")
+            return None
+        return [by_code[c.lower()] for c in codes]
+
+    def add_teacher_action(self, entries, list_box):
+        name = entries[0].get()
+        code = entries[1].get()
+        if name and code:
+            subject_ids = self.subject_ids_from_codes(entries[2].get())
+            if subject_ids is None:
+                return
+            teacher_id = self.db.add_teacher(name, code)
+            if teacher_id:
+                self.db.set_teacher_subjects(teacher_id, subject_ids)
+                for ent in entries:
+                    ent.delete(0, 'end')
+                list_box.appended()
+            else:
+                messagebox.showerror("Error", "Teacher Code must be unique.")
+        else:
+            messagebox.showerror("Error", "All fields are required.")
+            
+    def add_section_action(self, entries, list_box):
+        name = entries[0].get()
+        strength = entries[1].get().strip()
+        shift = entries[3].get().strip()
+        if name:
+            if strength and not strength.isdigit():
+                messagebox.showerror("Error", "Strength must be a whole number.")
+                return
+            shifts = {shift_name.lower(): shift_id for shift_id, shift_name in self.db.fetch_all("shifts")}
+            if shift and shift.lower() not in shifts:
+                messagebox.showerror("Error", f"Unknown shift: {shift}")
+                return
+            subject_ids = self.subject_ids_from_codes(entries[2].get())
+            if subject_ids is None:
+                return
+            section_id = self.db.add_section(name, int(strength) if strength else None, shifts.get(shift.lower()))
+            if section_id:
+                self.db.set_section_subjects(section_id, subject_ids)
+                for ent in entries:
+                    ent.delete(0, 'end')
+                list_box.appended()
+            else:
+                messagebox.showerror("Error", "Section Name must be unique.")
+
+    def import_action(self, table, list_box):
+        path = filedialog.askopenfilename(filetypes=[("Excel or CSV", "*.xlsx *.csv"), ("Excel file", "*.xlsx"),
+                                                     ("CSV file", "*.csv")])
+        if not path: return
+        try:
+            reports = import_file(self.db, path, table)
+        except Exception as e:
+            messagebox.showerror("Error", f"Could not import file: {e}")
+            return
+        list_box.refresh()
+
+        report = reports[0]
+        lines = [f"Imported {report.inserted} row(s), skipped {len(report.duplicates)} duplicate(s)."]
+        if report.errors:
+            lines.append(f"{len(report.errors)} row(s) rejected:")
+            lines += [f"  Row {line_no}: {msg}" for line_no, msg in report.errors[:15]]
+            if len(report.errors) > 15:
+                lines.append(f"  ... and {len(report.errors) - 15} more")
+        messagebox.showinfo("Import", "\n".join(lines))
+
+    def import_calendar(self):
+        # A workbook with Shifts, Calendar Days and Calendar Slots sheets (or one of their CSVs)
+        path = filedialog.askopenfilename(filetypes=[("Excel or CSV", "*.xlsx *.csv"), ("Excel file", "*.xlsx"),
+                                                     ("CSV file", "*.csv")])
+        if not path: return
+        try:
+            reports = import_file(self.db, path)
+            self.refresh_calendar()
+        except Exception as e:
+            messagebox.showerror("Error", f"Could not import calendar: {e}")
+            return
+        lines = []
+        for report in reports:
+            lines.append(f"{report.table}: imported {report.inserted}, skipped {len(report.duplicates)} duplicate(s)")
+            lines += [f"  Row {line_no}: {msg}" for line_no, msg in report.errors[:10]]
+        messagebox.showinfo("Import", "\n".join(lines))
+
+    def reset_calendar(self):
+        if messagebox.askyesno("Reset Calendar", "Remove all days, shifts and slots and use the default week?"):
+            self.db.clear_calendar()
+            self.refresh_calendar()
+
+    def show_frame(self, name):
+        # Update Dashboard Stats on switch
+        if name == "Dashboard":
+            t = self.db.count("teachers")
+            s = self.db.count("subjects")
+            r = self.db.count("rooms")
+            sec = self.db.count("sections")
+            self.stats_label.configure(text=f"Database Status:\nTeachers: {t}\nSubjects: {s}\nRooms: {r}\nSections: {sec}")
+
+        # Hide all, show selected
+        for frame in self.frames.values():
+            frame.grid_forget()
+        self.frames[name].grid(row=0, column=1, sticky="nsew", padx=20, pady=20)
+
+    def change_scaling(self, new_scaling: str):
+        new_scaling_float = int(new_scaling.replace("%", "")) / 100
+        ctk.set_widget_scaling(new_scaling_float)
+
+    def run_generation(self):
+        # Reading the data, solving and saving all happen on the job thread (it
+        # has its own database connection), so the window never waits on them
+        seed = self.seed_ent.get().strip()
+        if seed and not seed.isdigit():
+            messagebox.showerror("Error", "Seed must be a whole number.")
+            return
+        seed = int(seed) if seed else None
+        use_cache = bool(self.cache_chk.get())
+        stats = SolverStats()
+        mode = self.SOLVER_MODES[self.solver_opt.get()]
+        runs = int(self.runs_opt.get().split()[0])
+        optimize = bool(self.optimize_chk.get())
+        self.scheduler.optimize_time = self.OPTIMIZE_SECONDS if optimize and seed is None else 0.0
+        self.scheduler.optimize_moves = self.OPTIMIZE_MOVES if optimize and seed is not None else None
+        if self.partition_chk.get():
+            job = lambda monitor: self.scheduler.generate_partitioned(mode=mode, seed=seed, monitor=monitor,
+                                                                      stats=stats, use_cache=use_cache)
+        elif runs > 1:
+            job = lambda monitor: self.scheduler.generate_parallel(runs=runs, mode=mode, seed=seed, monitor=monitor,
+                                                                   stats=stats, use_cache=use_cache)
+        else:
+            job = lambda monitor: self.scheduler.generate(mode, seed=seed, monitor=monitor, stats=stats,
+                                                          use_cache=use_cache)
+        self.start_job("Generating schedule...", job, mode, "Generation Successful!", stats)
+
+    def repair_schedule(self):
+        if not self.schedule_data: return
+        unavailable = {}
+        code = self.leave_code_ent.get()
+        if code:
+            matches = [t[0] for t in self.db.fetch_all("teachers") if t[2] == code]
+            if not matches:
+                messagebox.showerror("Error", f"No teacher with code {code}.")
+                return
+            unavailable[matches[0]] = [self.leave_day_opt.get()]
+
+        stats = SolverStats()
+        mode = self.SOLVER_MODES[self.solver_opt.get()]
+        schedule = self.schedule_data
+        job = lambda monitor: self.scheduler.reschedule(schedule, teacher_unavailable=unavailable, mode=mode,
+                                                        monitor=monitor, stats=stats)
+        self.start_job("Repairing schedule...", job, mode, None, stats)
+
+    # --- BACKGROUND JOBS ---
+    def start_job(self, title, job, mode, headline, stats=None):
+        # Runs job(monitor) on a worker thread, saves what it produced there and
+        # polls its progress with after(); stats (filled in by the job) is
+        # summarised under the result
+        self.preview_area.configure(state="normal")
+        self.preview_area.delete("1.0", "end")
+        self.preview_area.insert("end", title + "\n")
+        self.progress_bar.set(0)
+        self.progress_label.configure(text="")
+        self.set_busy(True)
+
+        self.job_monitor = SolverMonitor()
+        self.job_result = None
+        self.job_stats = stats
+
+        def work():
+            try:
+                result = job(self.job_monitor)
+                if result[0] and not self.scheduler.last_cached:
+                    self.scheduler.save_schedule(result[0], mode, self.scheduler.last_seed)
+                self.job_result = result
+            except Exception as e:
+                self.job_result = (None, f"Error: {e}")
+
+        self.job_thread = threading.Thread(target=work, daemon=True)
+        self.job_thread.start()
+        self.after(100, self.poll_job, mode, headline)
+
+    def poll_job(self, mode, headline):
+        progress = self.job_monitor.snapshot()
+        if progress["total_hours"]:
+            self.progress_bar.set(progress["placed_hours"] / progress["total_hours"])
+        best = progress["best"]
+        if isinstance(best, ScheduleScore):
+            best = f"{best.unplaced_hours} unplaced / {best.gaps} gaps"
+        self.progress_label.configure(
+            text=f"Sections done: {progress['sections_done']}/{progress['sections_total']} | "
+                 f"Hours placed: {progress['placed_hours']}/{progress['total_hours']} | Best: {best if best is not None else '-'}")
+
+        if self.job_thread.is_alive():
+            self.after(100, self.poll_job, mode, headline)
+            return
+
+        self.set_busy(False)
+        schedule, status = self.job_result
+        if status.startswith("Cancelled"):
+            headline = "Cancelled - kept the best partial result."
+        elif status.startswith("Incomplete"):
+            headline = status
+        elif status.endswith("(cached)"):
+            headline = "Data unchanged - reused the cached result."
+        self.show_result(schedule, status, headline or status, self.job_stats)
+
+    def cancel_job(self):
+        self.job_monitor.cancel()
+        self.cancel_btn.configure(state="disabled")
+
+    def set_busy(self, busy):
+        state = "disabled" if busy else "normal"
+        self.gen_btn.configure(state=state)
+        self.cancel_btn.configure(state="normal" if busy else "disabled")
+        if busy:
+            self.export_btn.configure(state="disabled")
+            self.repair_btn.configure(state="disabled")
+        elif self.schedule_data:
+            self.export_btn.configure(state="normal")
+            self.repair_btn.configure(state="normal")
+
+    def show_result(self, schedule, status, headline, stats=None):
+        if schedule:
+            self.schedule_data = schedule
+            self.preview_area.insert("end", headline + "\n")
+            score = self.scheduler.last_score
+            self.preview_area.insert("end", f"Seed: {self.scheduler.last_seed} | Unplaced hours: {score.unplaced_hours} | "
+                                            f"Violations: {score.violations} | Gaps: {score.gaps}\n")
+            checks = summarize(self.scheduler.validate(schedule, self.scheduler.last_problem))
+            self.preview_area.insert("end", f"Checks: {checks}\n\n")
+            if stats is not None:
+                self.preview_area.insert("end", stats.summary(self.scheduler.last_problem) + "\n\n")
+            self.show_grid(schedule)
+            self.export_btn.configure(state="normal")
+            self.repair_btn.configure(state="normal")
+        else:
+            self.preview_area.insert("end", f"Failed: {status}")
+            self.export_btn.configure(state="disabled")
+            
+        self.preview_area.configure(state="disabled")
+
+    def show_grid(self, schedule):
+        sections = self.db.fetch_all("sections")
+        self.grid_view.show_schedule(self.scheduler.build_views(schedule, sections), self.scheduler.days,
+                                     self.scheduler.slots, self.scheduler.section_slots(sections))
+
+    def export_file(self):
+        if not self.schedule_data: return
+        filename = filedialog.asksaveasfilename(defaultextension=".xlsx", 
+                                                filetypes=[("Excel file", "*.xlsx")])
+        if filename:
+            try:
+                views = ("section", "teacher", "room") if self.export_views_chk.get() else ("section",)
+                self.scheduler.export_to_excel(self.schedule_data, filename, views=views)
+                messagebox.showinfo("Success", "Timetable exported successfully!")
+            except Exception as e:
+                messagebox.showerror("Error", f"Could not save file: {e}")
@@ -0,0 +1,116 @@
+import csv
+import json
+from collections import Counter, namedtuple
+
+# --- SCHEDULE VALIDATION ---
+# One finding about a finished schedule. day / slot are calendar indices and
+# ids that do not apply (a shortfall has no day or room) are None.
+Violation = namedtuple("Violation", "kind day slot section_id subject_id teacher_id room_id detail")
+
+# Kinds that break a rule the solvers must never break; the rest are findings
+HARD_KINDS = {"teacher_clash", "room_clash", "outside_shift", "unqualified_teacher"}
+REPORT_COLUMNS = ["kind", "severity", "day", "slot", "section", "subject", "teacher", "room", "detail"]
+
+
+def validate_schedule(problem, schedule, max_daily_hours=5):
+    # Streams every Violation of `schedule` (Scheduler.build_schedule shape)
+    # against `problem` from a single pass over its entries. Inverted indexes
+    # (day, slot, teacher / room -> section) are filled during that pass, so a
+    # clash, a Lab in a lecture hall (or the reverse), an undersized room, an
+    # unqualified teacher or a lesson outside the section's shift is yielded
+    # the moment its entry is read. Hour shortfalls per (section, subject) and
+    # teachers over max_daily_hours need the totals and come after the pass.
+    teacher_at, room_at = {}, {}  # (day, slot, teacher / room id) -> section there
+    hours = Counter()  # (section, subject) -> hours placed
+    teacher_day = Counter()  # (teacher, day) -> hours taught
+    for day, periods in enumerate(schedule):
+        for slot, cell in enumerate(periods):
+            for sec_id, entry in cell.items():
+                sub_id, teacher_id, room_id = entry["subject_id"], entry["teacher_id"], entry["room_id"]
+                ids = (day, slot, sec_id, sub_id, teacher_id, room_id)
+                hours[sec_id, sub_id] += 1
+                teacher_day[teacher_id, day] += 1
+
+                other = teacher_at.setdefault((day, slot, teacher_id), sec_id)
+                if other != sec_id:
+                    yield Violation("teacher_clash", *ids, f"also teaching {_name(problem.sections, other)}")
+                other = room_at.setdefault((day, slot, room_id), sec_id)
+                if other != sec_id:
+                    yield Violation("room_clash", *ids, f"room also holds {_name(problem.sections, other)}")
+
+                subject, room, section = (problem.subjects.get(sub_id), problem.rooms.get(room_id),
+                                          problem.sections.get(sec_id))
+                if subject and room:
+                    wanted = 'Lab' if subject[3] == 'Lab' else 'Lecture Hall'
+                    if room[3] != wanted:
+                        yield Violation("room_type", *ids, f"{subject[3]} held in a {room[3]}")
+                strength = section[2] if section and len(section) > 2 else None
+                if strength and room and room[2] is not None and strength > room[2]:
+                    yield Violation("capacity", *ids, f"{strength} students in a room for {room[2]}")
+                lesson = problem.lesson_index.get((sec_id, sub_id))
+                if lesson and teacher_id in problem.teacher_bit \
+                        and not lesson.teacher_pool & problem.teacher_bit[teacher_id]:
+                    yield Violation("unqualified_teacher", *ids, "teacher is not mapped to this subject")
+                if section and not problem.shift_periods(sec_id) >> slot & 1:
+                    yield Violation("outside_shift", *ids, "period is not in the section's shift")
+
+    for sec_id in problem.sections:
+        for sub_id in problem.section_subjects.get(sec_id) or problem.subjects:
+            required = problem.subjects[sub_id][4]
+            placed = hours.pop((sec_id, sub_id), 0)
+            if placed < required:
+                yield Violation("shortfall", None, None, sec_id, sub_id, None, None,
+                                f"{placed} of {required} hours scheduled")
+    for (sec_id, sub_id), placed in hours.items():
+        yield Violation("unexpected_subject", None, None, sec_id, sub_id, None, None,
+                        f"{placed} hours of a subject the section does not take")
+    for (teacher_id, day), load in teacher_day.items():
+        if load > max_daily_hours:
+            yield Violation("teacher_overload", day, None, None, None, teacher_id, None,
+                            f"{load} hours in one day (limit {max_daily_hours})")
+
+
+def _name(rows, key):
+    row = rows.get(key)
+    return row[1] if row else f"#{key}"
+
+
+def report_rows(problem, violations):
+    # Violations as flat dicts (REPORT_COLUMNS) with names and calendar labels
+    days, slots = problem.calendar.days, problem.calendar.slot_labels
+    for v in violations:
+        yield {
+            "kind": v.kind,
+            "severity": "hard" if v.kind in HARD_KINDS else "soft",
+            "day": days[v.day] if v.day is not None and v.day < len(days) else "",
+            "slot": slots[v.slot] if v.slot is not None and v.slot < len(slots) else "",
+            "section": _name(problem.sections, v.section_id) if v.section_id is not None else "",
+            "subject": _name(problem.subjects, v.subject_id) if v.subject_id is not None else "",
+            "teacher": _name(problem.teachers, v.teacher_id) if v.teacher_id is not None else "",
+            "room": _name(problem.rooms, v.room_id) if v.room_id is not None else "",
+            "detail": v.detail,
+        }
+
+
+def write_report(path, problem, violations):
+    # Writes violations to a .csv or .json file (by extension) row by row as
+    # they are produced; returns how many were written
+    count = 0
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        if path.lower().endswith(".json"):
+            f.write("[")
+            for count, row in enumerate(report_rows(problem, violations), start=1):
+                f.write(("," if count > 1 else "") + "\n  " + json.dumps(row))
+            f.write("\n]\n")
+        else:
+            writer = csv.DictWriter(f, fieldnames=REPORT_COLUMNS)
+            writer.writeheader()
+            for count, row in enumerate(report_rows(problem, violations), start=1):
+                writer.writerow(row)
+    return count
+
+
+def summarize(violations):
+    # "no violations" or e.g. "3 shortfall, 1 room_type", most frequent first
+    counts = Counter(v.kind for v in violations)
+    return ", ".join(f"{n} {kind}" for kind, n in counts.most_common()) or "no violations"
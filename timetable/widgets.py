@@ -0,0 +1,284 @@
+from collections import Counter
+from tkinter import messagebox
+
+import customtkinter as ctk
+
+from .db import IMPORT_SPECS
+
+
+# --- RECORD LIST ---
+class RecordList(ctk.CTkFrame):
+    # Virtualized view of one data table. Only `visible_rows` rows of widgets
+    # exist; scrolling refills them from a LIMIT/OFFSET window query, so a
+    # redraw costs the same with 20 records or 50,000. The search box keeps
+    # the records whose name (or code) starts with the text, using the NOCASE
+    # indexes. Each row can be edited in place (Edit / Save) or deleted.
+    def __init__(self, master, db, table, headers, visible_rows=15, on_change=None, **kwargs):
+        super().__init__(master, **kwargs)
+        self.db = db
+        self.table = table
+        self.columns = IMPORT_SPECS[table]["columns"]
+        self.visible_rows = visible_rows
+        self.on_change = on_change
+        self.offset = 0
+        self.total = 0
+        self.search = ""
+        self.window = []
+        self.editing = None  # index of the row being edited
+        self.search_job = None
+
+        top = ctk.CTkFrame(self, fg_color="transparent")
+        top.pack(fill="x", pady=(0, 5))
+        self.search_ent = ctk.CTkEntry(top, placeholder_text="Search (name or code starts with...)", width=300)
+        self.search_ent.pack(side="left", padx=5)
+        self.search_ent.bind("<KeyRelease>", self.on_search)
+        self.count_label = ctk.CTkLabel(top, text="")
+        self.count_label.pack(side="right", padx=5)
+
+        body = ctk.CTkFrame(self)
+        body.pack(fill="both", expand=True)
+        grid = ctk.CTkFrame(body, fg_color="transparent")
+        grid.pack(side="left", fill="both", expand=True, padx=5, pady=5)
+        for col, text in enumerate(headers):
+            ctk.CTkLabel(grid, text=text, font=("Arial", 13, "bold"), anchor="w").grid(row=0, column=col, padx=3,
+                                                                                     sticky="w")
+        self.rows = []
+        for i in range(visible_rows):
+            id_label = ctk.CTkLabel(grid, text="", width=50, anchor="w")
+            id_label.grid(row=i + 1, column=0, padx=3, sticky="w")
+            cells = []
+            for col in range(len(self.columns)):
+                ent = ctk.CTkEntry(grid, width=140)
+                ent.grid(row=i + 1, column=col + 1, padx=3, pady=1)
+                cells.append(ent)
+            edit_btn = ctk.CTkButton(grid, text="Edit", width=60, command=lambda i=i: self.toggle_edit(i))
+            edit_btn.grid(row=i + 1, column=len(self.columns) + 1, padx=3)
+            del_btn = ctk.CTkButton(grid, text="Delete", width=60, fg_color="firebrick",
+                                    command=lambda i=i: self.delete_row(i))
+            del_btn.grid(row=i + 1, column=len(self.columns) + 2, padx=3)
+            self.rows.append((id_label, cells, edit_btn, del_btn))
+            for widget in [id_label] + cells:
+                self.bind_wheel(widget)
+
+        self.scrollbar = ctk.CTkScrollbar(body, command=self.on_scrollbar)
+        self.scrollbar.pack(side="right", fill="y")
+        self.bind_wheel(grid)
+        self.refresh()
+
+    def bind_wheel(self, widget):
+        widget.bind("<MouseWheel>", self.on_wheel)  # Windows / macOS
+        widget.bind("<Button-4>", self.on_wheel)  # X11 wheel up
+        widget.bind("<Button-5>", self.on_wheel)  # X11 wheel down
+
+    # --- DATA WINDOW ---
+    def refresh(self):
+        # Re-counts and re-reads the visible window (after an import, edit or delete)
+        self.total = self.db.count(self.table, self.search)
+        self.offset = max(0, min(self.offset, self.total - self.visible_rows))
+        self.load_window()
+
+    def appended(self):
+        # One record was added (it has the highest id): scroll to the end so it
+        # shows, reading only that last window
+        if self.search:
+            self.refresh()
+            return
+        self.total += 1
+        self.offset = max(0, self.total - self.visible_rows)
+        self.load_window()
+
+    def scroll_to(self, offset):
+        offset = max(0, min(offset, self.total - self.visible_rows))
+        if offset != self.offset:
+            self.offset = offset
+            self.load_window()
+
+    def load_window(self):
+        self.editing = None
+        self.window = self.db.fetch_window(self.table, self.offset, self.visible_rows, self.search)
+        for i, (id_label, cells, edit_btn, del_btn) in enumerate(self.rows):
+            record = self.window[i] if i < len(self.window) else None
+            id_label.configure(text=str(record[0]) if record else "")
+            for col, ent in enumerate(cells):
+                value = record[col + 1] if record else None
+                self.set_cell(ent, "" if value is None else str(value))
+            state = "normal" if record else "disabled"
+            edit_btn.configure(text="Edit", state=state)
+            del_btn.configure(state=state)
+
+        if self.total:
+            self.scrollbar.set(self.offset / self.total, (self.offset + len(self.window)) / self.total)
+            self.count_label.configure(text=f"{self.offset + 1}-{self.offset + len(self.window)} of {self.total}")
+        else:
+            self.scrollbar.set(0, 1)
+            self.count_label.configure(text="No records")
+
+    @staticmethod
+    def set_cell(ent, text):
+        ent.configure(state="normal")
+        ent.delete(0, "end")
+        ent.insert(0, text)
+        ent.configure(state="disabled")
+
+    # --- EVENTS ---
+    def on_scrollbar(self, action, amount, unit=None):
+        if action == "moveto":
+            self.scroll_to(int(float(amount) * self.total))
+        else:
+            step = self.visible_rows if unit == "pages" else 1
+            self.scroll_to(self.offset + int(amount) * step)
+
+    def on_wheel(self, event):
+        up = event.num == 4 or getattr(event, "delta", 0) > 0
+        self.scroll_to(self.offset + (-3 if up else 3))
+
+    def on_search(self, event=None):
+        # Waits for a pause in typing before querying
+        if self.search_job is not None:
+            self.after_cancel(self.search_job)
+        self.search_job = self.after(150, self.apply_search)
+
+    def apply_search(self):
+        self.search_job = None
+        self.search = self.search_ent.get().strip()
+        self.offset = 0
+        self.refresh()
+
+    def toggle_edit(self, i):
+        record = self.window[i]
+        _, cells, edit_btn, _ = self.rows[i]
+        if self.editing != i:
+            if self.editing is not None:
+                self.load_window()  # Drops the other row's unsaved edit
+            self.editing = i
+            for ent in cells:
+                ent.configure(state="normal")
+            edit_btn.configure(text="Save")
+            return
+
+        row = dict(zip(self.columns, (ent.get() for ent in cells)))
+        try:
+            self.db.update_record(self.table, record[0], row)
+        except ValueError as e:
+            messagebox.showerror("Error", f"Could not save: {e}")
+            return
+        self.load_window()
+        if self.on_change:
+            self.on_change()
+
+    def delete_row(self, i):
+        record = self.window[i]
+        if not messagebox.askyesno("Delete", f"Delete {record[1]} (ID {record[0]})?"):
+            return
+        self.db.delete_record(self.table, record[0])
+        self.refresh()
+        if self.on_change:
+            self.on_change()
+
+
+# --- SCHEDULE GRID ---
+class ScheduleGrid(ctk.CTkFrame):
+    # Day x slot timetable of one section, teacher or room at a time, fed with
+    # the per-entity views of Scheduler.build_views (built once per schedule),
+    # whose (day, slot) indices are turned into the calendar's labels here.
+    # There is only one grid of cells; switching entity just re-labels them,
+    # unless it needs other columns (a section only shows its shift's periods).
+    KINDS = {"Section": "section", "Teacher": "teacher", "Room": "room"}
+
+    def __init__(self, master, **kwargs):
+        super().__init__(master, **kwargs)
+        self.views = {}
+        self.kind = "section"
+        self.ids = []
+        self.labels = []
+        self.index = 0
+        self.days, self.slots = [], []
+        self.section_slots = {}
+        self.columns = None  # slot indices the cells are built for
+        self.cells = {}
+
+        bar = ctk.CTkFrame(self, fg_color="transparent")
+        bar.pack(fill="x", pady=5)
+        self.kind_btn = ctk.CTkSegmentedButton(bar, values=list(self.KINDS), command=self.set_kind)
+        self.kind_btn.set("Section")
+        self.kind_btn.pack(side="left", padx=5)
+        ctk.CTkButton(bar, text="<", width=30, command=lambda: self.step(-1)).pack(side="left", padx=(15, 2))
+        self.entity_opt = ctk.CTkOptionMenu(bar, values=["-"], width=240, command=self.select_label)
+        self.entity_opt.pack(side="left", padx=2)
+        ctk.CTkButton(bar, text=">", width=30, command=lambda: self.step(1)).pack(side="left", padx=2)
+        self.usage_label = ctk.CTkLabel(bar, text="")
+        self.usage_label.pack(side="right", padx=5)
+
+        self.table = ctk.CTkFrame(self)
+        self.table.pack(fill="both", expand=True, padx=5, pady=5)
+
+    def show_schedule(self, views, days, slots, section_slots=None):
+        # New schedule: keep the chosen kind and, if it still exists, the entity.
+        # section_slots: {section id: slot indices of its shift} (Scheduler.section_slots)
+        current = self.ids[self.index] if self.ids else None
+        self.views = views
+        self.section_slots = section_slots or {}
+        if (list(days), list(slots)) != (self.days, self.slots):
+            self.days, self.slots = list(days), list(slots)
+            self.columns = None
+        self.load_entities(current)
+
+    def build_cells(self, columns):
+        for widget in self.table.winfo_children():
+            widget.destroy()
+        self.columns = columns
+        bold = ("Arial", 12, "bold")
+        ctk.CTkLabel(self.table, text="Day / Time", font=bold).grid(row=0, column=0, padx=2, pady=2)
+        for col, slot in enumerate(columns):
+            ctk.CTkLabel(self.table, text=self.slots[slot], font=bold).grid(row=0, column=col + 1, padx=2, pady=2)
+        self.cells = {}  # (day, slot index) -> cell
+        for row, day in enumerate(self.days):
+            ctk.CTkLabel(self.table, text=day, font=bold, anchor="w").grid(row=row + 1, column=0, padx=4, sticky="w")
+            for col, slot in enumerate(columns):
+                cell = ctk.CTkLabel(self.table, text="", width=125, height=56, corner_radius=4,
+                                    fg_color=("gray85", "gray20"))
+                cell.grid(row=row + 1, column=col + 1, padx=2, pady=2, sticky="nsew")
+                self.cells[row, slot] = cell
+
+    def set_kind(self, label):
+        self.kind = self.KINDS[label]
+        self.load_entities()
+
+    def load_entities(self, keep=None):
+        entities = self.views.get(self.kind, {})
+        self.ids = list(entities)
+        names = Counter(name for name, _ in entities.values())
+        # Option labels must be unique; repeated names get their id appended
+        self.labels = [name if names[name] == 1 else f"{name} ({entity_id})"
+                       for entity_id, (name, _) in entities.items()]
+        self.entity_opt.configure(values=self.labels or ["-"])
+        self.index = self.ids.index(keep) if keep in entities else 0
+        self.render()
+
+    def select_label(self, label):
+        if label in self.labels:
+            self.index = self.labels.index(label)
+            self.render()
+
+    def step(self, delta):
+        if self.ids:
+            self.index = (self.index + delta) % len(self.ids)
+            self.render()
+
+    def render(self):
+        columns = list(range(len(self.slots)))
+        if self.kind == "section" and self.ids:
+            columns = self.section_slots.get(self.ids[self.index], columns)
+        if columns != self.columns:
+            self.build_cells(columns)
+        if not self.ids:
+            self.entity_opt.set("-")
+            self.usage_label.configure(text="")
+            for cell in self.cells.values():
+                cell.configure(text="")
+            return
+        _, cells = self.views[self.kind][self.ids[self.index]]
+        self.entity_opt.set(self.labels[self.index])
+        for key, cell in self.cells.items():
+            cell.configure(text=cells.get(key, ""))
+        self.usage_label.configure(text=f"{len(cells)} of {len(self.cells)} periods in use")